@@ -0,0 +1,190 @@
+import os
+import shutil
+import itertools
+
+from rasterize import render_region, scratch_dir
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+LOW_DPI = 150
+HIGH_DPI = 300
+MIN_CONFIDENCE = 0.80    # 0..1 per line; Tesseract's 0..100 is rescaled
+REGION_PAD = 6           # low-DPI pixels added around a line before re-rendering
+MAX_REGION_SHARE = 0.5   # above this share of weak lines, re-render the whole page
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def line(text, confidence, box, dpi=None):
+    """One recognized line; box is (x0, y0, x1, y1) in pixels at `dpi`."""
+    return {"text": text, "confidence": confidence, "box": list(box), "dpi": dpi}
+
+
+def page_confidence(lines):
+    """Character-weighted mean line confidence, None for a page without text."""
+    chars = sum(len(l["text"]) for l in lines)
+    if not chars:
+        return None
+    return sum(l["confidence"] * len(l["text"]) for l in lines) / chars
+
+
+def scale_box(box, factor, pad=0):
+    x0, y0, x1, y1 = box
+    return (
+        max(0, int((x0 - pad) * factor)),
+        max(0, int((y0 - pad) * factor)),
+        int((x1 + pad) * factor) + 1,
+        int((y1 + pad) * factor) + 1,
+    )
+
+
+# -------------------------
+# ADAPTIVE OCR
+# -------------------------
+class AdaptiveOCR:
+    """
+    Two-pass OCR: every page is read at low_dpi, and only lines whose
+    confidence is below min_confidence are re-rendered at high_dpi and read
+    again (mode="region"). When most of a page is weak, or with
+    mode="page", the whole page is re-rendered and re-read instead.
+
+    read_page(image) -> [line(...), ...] for a page image (path or array)
+    read_line(path)  -> (text, confidence) for a single cropped text line
+    """
+
+    def __init__(self, pdf, read_page, read_line=None, low_dpi=LOW_DPI, high_dpi=HIGH_DPI,
+                 min_confidence=MIN_CONFIDENCE, mode="region", work_dir=None):
+        if mode == "region" and read_line is None:
+            raise ValueError("region mode needs a read_line function")
+        self.pdf = pdf
+        self.read_page = read_page
+        self.read_line = read_line
+        self.low_dpi = low_dpi
+        self.high_dpi = high_dpi
+        self.min_confidence = min_confidence
+        self.mode = mode
+        # high-DPI renders go to work_dir, or a scratch dir removed by close()
+        self.work_dir = work_dir
+        self.scratch = None
+        self.counter = itertools.count()
+
+    def _render(self, page_num, box=None):
+        if self.work_dir is None:
+            self.scratch = self.work_dir = scratch_dir()
+        path = os.path.join(self.work_dir, f"p{page_num}-{next(self.counter)}.png")
+        return render_region(self.pdf, page_num, self.high_dpi, path, box)
+
+    def _read(self, image, dpi):
+        lines = self.read_page(image)
+        for l in lines:
+            l["dpi"] = dpi
+        return lines
+
+    def ocr(self, page_num, image):
+        """
+        Returns (lines, stats) for one page rendered at low_dpi; stats is
+        what EscalationReport.add() expects.
+        """
+        lines = self._read(image, self.low_dpi)
+        stats = {
+            "page": page_num,
+            "confidence": page_confidence(lines),
+            "escalated": None,
+            "lines": len(lines),
+            "regions": 0,
+            "improved": 0,
+        }
+        weak = [i for i, l in enumerate(lines) if l["confidence"] < self.min_confidence]
+        if not weak:
+            return lines, stats
+
+        if self.mode == "page":
+            if stats["confidence"] >= self.min_confidence:
+                return lines, stats
+        elif len(weak) <= MAX_REGION_SHARE * len(lines):
+            return self._reread_regions(page_num, lines, weak, stats)
+
+        path = self._render(page_num)
+        try:
+            lines = self._read(path, self.high_dpi)
+        finally:
+            os.remove(path)
+        stats["escalated"] = "page"
+        stats["confidence"] = page_confidence(lines)
+        stats["lines"] = len(lines)
+        return lines, stats
+
+    def _reread_regions(self, page_num, lines, weak, stats):
+        factor = self.high_dpi / self.low_dpi
+        for i in weak:
+            box = scale_box(lines[i]["box"], factor, REGION_PAD)
+            path = self._render(page_num, box)
+            try:
+                text, confidence = self.read_line(path)
+            finally:
+                os.remove(path)
+            stats["regions"] += 1
+            if text and confidence > lines[i]["confidence"]:
+                lines[i] = line(text, confidence, box, self.high_dpi)
+                stats["improved"] += 1
+
+        stats["escalated"] = "region"
+        stats["confidence"] = page_confidence(lines)
+        return lines, stats
+
+    def close(self):
+        if self.scratch is not None:
+            shutil.rmtree(self.scratch, ignore_errors=True)
+            self.scratch = self.work_dir = None
+
+
+class EscalationReport:
+    """Tally of per-page stats from AdaptiveOCR.ocr(), across processes."""
+
+    def __init__(self):
+        self.pages = 0
+        self.escalated_pages = 0
+        self.region_pages = 0
+        self.regions = 0
+        self.improved = 0
+        self.weakest = []
+
+    def add(self, stats):
+        self.pages += 1
+        if stats["escalated"] == "page":
+            self.escalated_pages += 1
+        elif stats["escalated"] == "region":
+            self.region_pages += 1
+            self.regions += stats["regions"]
+            self.improved += stats["improved"]
+        if stats["confidence"] is not None:
+            self.weakest.append((stats["confidence"], stats["page"]))
+
+    def report(self):
+        lines = [
+            f"Adaptive OCR: {self.pages} page(s), "
+            f"{self.escalated_pages} re-read whole at high DPI, "
+            f"{self.region_pages} with {self.regions} region(s) re-read "
+            f"({self.improved} improved)"
+        ]
+        weakest = sorted(self.weakest)[:5]
+        if weakest:
+            lines.append("Lowest final confidence: " + ", ".join(
+                f"page {page} ({conf:.2f})" for conf, page in weakest
+            ))
+        return "\n".join(lines)
+
+
+def add_adaptive_args(parser, low_dpi=LOW_DPI, high_dpi=HIGH_DPI, regions=True):
+    parser.add_argument("--adaptive", action="store_true",
+                        help="OCR at --low-dpi and re-read low-confidence text at --high-dpi")
+    parser.add_argument("--low-dpi", type=int, default=low_dpi)
+    parser.add_argument("--high-dpi", type=int, default=high_dpi)
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE,
+                        help="confidence (0-1) below which text is re-read")
+    if regions:
+        parser.add_argument("--escalate", choices=["region", "page"], default="region",
+                            help="re-read only weak lines, or whole weak pages")
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+
+from janes_io import iter_records
+from synth_janes import write_html, write_pdf
+
+# -------------------------
+# CONFIG
+# -------------------------
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = "bench_results"
+SIZES = "10,50,200"          # countries per synthetic book
+CLASSES_PER_COUNTRY = 20
+PAGES_PER_COUNTRY = 0.2      # synthetic PDF pages per country (0 disables OCR runs)
+
+# The scripts read these fixed names from the working directory.
+HTML_NAME = "Janes 2023-2024 (1).htm"
+PDF_NAME = "janes10.pdf"
+
+
+# -------------------------
+# RUNNER
+# -------------------------
+def run(cmd, cwd):
+    """Run one pipeline step; returns (wall seconds, cpu seconds, peak RSS MB, ok)."""
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    with tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=err)
+        # wait4 gives the rusage of this child (and its own children) only
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        if proc.returncode != 0:
+            err.seek(0)
+            lines = err.read().decode("utf-8", "replace").strip().splitlines()
+            print(lines[-1] if lines else "failed", file=sys.stderr)
+
+    cpu = usage.ru_utime + usage.ru_stime
+    return wall, cpu, usage.ru_maxrss / 1024, proc.returncode == 0
+
+
+def count_records(path):
+    return sum(1 for _ in iter_records(path)) if os.path.exists(path) else 0
+
+
+def have(module=None, binary=None):
+    if module and importlib.util.find_spec(module) is None:
+        return False
+    if binary and shutil.which(binary) is None:
+        return False
+    return True
+
+
+def have_tesseract():
+    return have("tesserocr") or have("pytesseract", "tesseract")
+
+
+def script(name):
+    return [sys.executable, os.path.join(REPO_DIR, name)]
+
+
+def html_steps(workers):
+    """(name, command, output file, available) for the HTML → JSON stages."""
+    steps = [
+        ("extract_raw", script("extract_janes_raw.py"), "raw_extracted.json", True),
+        ("extract_raw_sharded", script("extract_janes_raw.py") + ["--workers", str(workers),
+         "--output", "raw_sharded.json"], "raw_sharded.json", True),
+        ("extract_raw_soup", script("janes_engine.py") + ["--html", HTML_NAME, "--profiles",
+         "raw", "--parser", "soup", "--out-dir", "soup"], "soup/raw.json", have("bs4")),
+    ]
+    for profile in ("high_coverage", "final_high_coverage", "platform"):
+        steps.append((
+            f"extract_{profile}",
+            script("janes_engine.py") + ["--html", HTML_NAME, "--profiles", profile,
+                                         "--out-dir", "profiles"],
+            f"profiles/{profile}.json",
+            True,
+        ))
+    steps += [
+        ("extract_all_profiles", script("janes_engine.py") + ["--html", HTML_NAME,
+         "--out-dir", "all"], "all/raw.json", True),
+        ("normalize", script("normalize_janes.py"), "final_output.json", True),
+        ("normalize_parallel", script("normalize_janes.py") + ["--workers", str(workers),
+         "--output", "final_parallel.json"], "final_parallel.json", True),
+    ]
+    return steps
+
+
+def ocr_steps(workers):
+    """(name, command, available) for the PDF → text stages."""
+    return [
+        ("ocr_tesseract", script("extract_streaming.py") + ["--workers", str(workers)],
+         have_tesseract() and have("pdf2image", "pdftoppm")),
+        ("ocr_tesseract_pipeline", script("extract_streaming.py") + ["--workers", str(workers),
+         "--pipeline", "--render-workers", "2"],
+         have_tesseract() and have("pdf2image", "pdftoppm")),
+        ("ocr_tesseract_adaptive", script("extract_streaming.py") + ["--workers", str(workers),
+         "--adaptive"], have_tesseract() and have("pdf2image", "pdftoppm")),
+        ("ocr_tesseract_triage", script("extract_streaming.py") + ["--workers", str(workers),
+         "--triage"], have_tesseract() and have("pdf2image", "pdftoppm")),
+        ("ocr_tesseract_text_layer", script("extract_streaming.py") + ["--workers", str(workers),
+         "--text-layer"], have_tesseract() and have("pdf2image", "pdftoppm")
+         and have(binary="pdftotext")),
+        ("ocr_paddle", script("paddle_ocr_10pages.py") + ["--no-cache"],
+         have("paddleocr", "pdftoppm")),
+        ("ocr_paddle_adaptive", script("paddle_ocr_10pages.py") + ["--no-cache", "--adaptive"],
+         have("paddleocr", "pdftoppm")),
+        ("ocr_paddle_in_memory", script("paddle_ocr_10pages.py") + ["--no-cache", "--in-memory"],
+         have("paddleocr", "pdftoppm") and have("pdf2image")),
+        ("ocr_structure", script("paddle_ocr_structure.py") + ["--no-cache"],
+         have("paddleocr", "pdftoppm")),
+        ("ocr_structure_layout_first", script("paddle_ocr_structure.py") + ["--no-cache",
+         "--layout-first"], have("paddleocr", "pdftoppm")),
+    ]
+
+
+def bench_size(countries, classes, pages_per_country, workers):
+    results = []
+    work = tempfile.mkdtemp(prefix="janes-bench-")
+
+    try:
+        blocks = write_html(os.path.join(work, HTML_NAME), countries, classes)
+        size_mb = os.path.getsize(os.path.join(work, HTML_NAME)) / 2**20
+        print(f"\n== {countries} countries, {blocks} classes, {size_mb:.1f} MB HTML ==")
+
+        for name, cmd, output, available in html_steps(workers):
+            if not available:
+                print(f"{name:28} skipped (dependency missing)")
+                continue
+            wall, cpu, rss, ok = run(cmd, work)
+            records = count_records(os.path.join(work, output)) if ok else 0
+            results.append({
+                "step": name, "countries": countries, "html_mb": round(size_mb, 2),
+                "ok": ok, "wall_s": round(wall, 3), "cpu_s": round(cpu, 3),
+                "peak_rss_mb": round(rss, 1), "records": records,
+                "records_per_s": round(records / wall, 1) if ok and wall else 0,
+            })
+            print(f"{name:28} {wall:8.2f}s {records / wall if ok else 0:10.1f} rec/s "
+                  f"{rss:8.1f} MB{'' if ok else '  FAILED'}")
+
+        pages = int(countries * pages_per_country)
+        if pages:
+            write_pdf(os.path.join(work, PDF_NAME), pages)
+            for name, cmd, available in ocr_steps(workers):
+                if not available:
+                    print(f"{name:28} skipped (dependency missing)")
+                    continue
+                shutil.rmtree(os.path.join(work, "output"), ignore_errors=True)
+                wall, cpu, rss, ok = run(cmd, work)
+                results.append({
+                    "step": name, "countries": countries, "pages": pages,
+                    "ok": ok, "wall_s": round(wall, 3), "cpu_s": round(cpu, 3),
+                    "peak_rss_mb": round(rss, 1),
+                    "pages_per_s": round(pages / wall, 3) if ok and wall else 0,
+                })
+                print(f"{name:28} {wall:8.2f}s {pages / wall if ok else 0:10.3f} pg/s "
+                      f"{rss:8.1f} MB{'' if ok else '  FAILED'}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    return results
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["step"], r["countries"]): r for r in json.load(f)["results"]}
+
+    print(f"\n== vs {baseline_path} (wall time, peak RSS) ==")
+    for r in current:
+        old = baseline.get((r["step"], r["countries"]))
+        if not old or not old["ok"] or not r["ok"]:
+            continue
+        dt = (r["wall_s"] - old["wall_s"]) / old["wall_s"] * 100 if old["wall_s"] else 0
+        dm = r["peak_rss_mb"] - old["peak_rss_mb"]
+        print(f"{r['step']:28} {r['countries']:5} {dt:+7.1f}% time {dm:+8.1f} MB")
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Janes pipeline on synthetic books")
+    parser.add_argument("--sizes", default=SIZES,
+                        help="comma-separated country counts, one synthetic book each")
+    parser.add_argument("--classes", type=int, default=CLASSES_PER_COUNTRY)
+    parser.add_argument("--pages-per-country", type=float, default=PAGES_PER_COUNTRY)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    results = []
+    for countries in (int(s) for s in args.sizes.split(",") if s.strip()):
+        results += bench_size(countries, args.classes, args.pages_per_country, args.workers)
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    path = os.path.join(args.results_dir, time.strftime("bench-%Y%m%d-%H%M%S.json"))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,35 @@
 import os
-import pytesseract
+import json
+import time
+import shutil
+import argparse
+from functools import partial
+from multiprocessing import Pool
+
 from PIL import Image
-from pdf2image import convert_from_path
-from pdf2image.pdf2image import pdfinfo_from_path
+
+from rasterize import (
+    iter_page_chunks, render_chunk, render_region, page_count, page_runs, scratch_dir,
+    CHUNK_SIZE, MAX_IN_FLIGHT, PAGE_NAME,
+)
+from page_guard import PageFailures, add_guard_args, fallback_dpi
+from page_pipeline import run_pipeline, QUEUE_SIZE
+from pipeline_metrics import add_metrics_args, instrument
+from adaptive_ocr import AdaptiveOCR, EscalationReport, add_adaptive_args, line
+from page_triage import triage, pages_for, summary, add_triage_args, OCR, STRUCTURE
+from pdf_text import iter_split, page_lines, sources_summary, add_text_layer_args
+from tesseract_engine import (
+    engine, configure, backend_name, add_engine_args, engine_settings, LINE_PSM,
+)
 
 
 PDF_FILE = "janes10.pdf"
 OUTPUT_DIR = "output"
 PAGES_DIR = os.path.join(OUTPUT_DIR, "pages")
 
-DPI = 150 
-
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-
-os.makedirs(PAGES_DIR, exist_ok=True)
+DPI = 150
 
-html_path = os.path.join(OUTPUT_DIR, "output.html")
-
-
-html = open(html_path, "w", encoding="utf-8")
-html.write("""
+HTML_HEAD = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -34,43 +44,344 @@ pre { background: #111; color: #f8f8f2; padding: 10px; white-space: pre-wrap; }
 </head>
 <body>
 <h1>OCR Output (Streaming)</h1>
-""")
+"""
 
 
-info = pdfinfo_from_path(PDF_FILE)
-total_pages = info["Pages"]
+def ocr_page(page):
+    """
+    OCR a single rendered page.
+    Runs unchanged in the main process or in a pool worker.
+    """
+    page_num, image_path = page
+    wall = time.perf_counter()
+    engine().start_page()
 
-print(f"Total pages to process: {total_pages}")
+    with Image.open(image_path) as page_image:
+        text = engine().text(page_image)
 
-for page_num in range(1, total_pages + 1):
-    print(f"Processing page {page_num}/{total_pages}")
+    # with the pytesseract fallback tesseract runs as a child process, so its
+    # CPU is not visible here
+    stats = {"wall_s": time.perf_counter() - wall}
+    return page_num, os.path.basename(image_path), text, stats
 
-    page_image = convert_from_path(
-        PDF_FILE,
-        dpi=DPI,
-        first_page=page_num,
-        last_page=page_num
-    )[0]
 
-    image_name = f"page_{page_num:04}.png"
-    image_path = os.path.join(PAGES_DIR, image_name)
-    page_image.save(image_path, "PNG")
+def tesseract_lines(image):
+    """Page text as adaptive_ocr lines, grouped the way Tesseract laid it out."""
+    grouped = {}
+    for w in engine().words(image):
+        grouped.setdefault(w["line"], []).append((w["text"], w["confidence"], w["box"]))
 
-    text = pytesseract.image_to_string(
-        page_image,
-        config="--oem 3 --psm 6"
-    )
+    lines = []
+    for words in grouped.values():
+        boxes = [b for _, _, b in words]
+        lines.append(line(
+            " ".join(w for w, _, _ in words),
+            sum(c for _, c, _ in words) / len(words),
+            (min(b[0] for b in boxes), min(b[1] for b in boxes),
+             max(b[2] for b in boxes), max(b[3] for b in boxes)),
+        ))
+    return lines
+
+
+def tesseract_line(path):
+    with Image.open(path) as crop:
+        words = [(w["text"], w["confidence"]) for w in engine().words(crop, LINE_PSM)]
+    if not words:
+        return "", 0.0
+    return " ".join(w for w, _ in words), sum(c for _, c in words) / len(words)
+
+
+# per-process engine for --adaptive, built on the first page
+ADAPTIVE = None
+
+
+def ocr_page_adaptive(settings, page):
+    """ocr_page with a low-DPI first pass and high-DPI re-reads of weak text."""
+    global ADAPTIVE
+    if ADAPTIVE is None:
+        ADAPTIVE = AdaptiveOCR(PDF_FILE, tesseract_lines, tesseract_line, **settings)
+
+    page_num, image_path = page
+    wall = time.perf_counter()
+    # the first pass and every re-read share one page budget
+    engine().start_page()
+
+    with Image.open(image_path) as page_image:
+        lines, escalation = ADAPTIVE.ocr(page_num, page_image)
 
+    text = "\n".join(l["text"] for l in lines)
+    stats = {"wall_s": time.perf_counter() - wall, "escalation": escalation}
+    return page_num, os.path.basename(image_path), text, stats
+
+
+def ocr_page_guarded(ocr, retry_dpi, page):
+    """
+    ocr(page), retried once with plain OCR of a retry_dpi render when it
+    times out or fails. A page that fails both comes back with empty text
+    and the errors in stats["failed"] instead of stopping the run.
+    """
+    page_num, image_path = page
+    wall = time.perf_counter()
+    retry_path = os.path.join(os.path.dirname(image_path), f".retry-{page_num}.png")
+
+    def retry():
+        try:
+            render_region(PDF_FILE, page_num, retry_dpi, retry_path)
+            return ocr_page((page_num, retry_path))
+        finally:
+            if os.path.exists(retry_path):
+                os.remove(retry_path)
+
+    failures = PageFailures()
+    result, attempt = failures.attempt(page_num, [
+        ("full", lambda: ocr(page)),
+        (f"{retry_dpi}dpi", retry),
+    ])
+
+    name = os.path.basename(image_path)
+    if result is None:
+        stats = {"wall_s": time.perf_counter() - wall, "failed": failures.failed[0]["errors"]}
+        return page_num, name, "", stats
+    _, _, text, stats = result
+    stats["attempt"] = attempt
+    if failures.recovered:
+        stats["errors"] = failures.recovered[0]["errors"]
+    return page_num, name, text, stats
+
+
+def save_page_image(result):
+    """Pipeline save stage: move a rendered page from scratch into PAGES_DIR."""
+    page_num, image_name, text, stats = result
+    wall = time.perf_counter()
+    shutil.move(stats.pop("path"), os.path.join(PAGES_DIR, image_name))
+    stats["save_s"] = time.perf_counter() - wall
+    return result
+
+
+def chunked_results(chunks, ocr, pool, metrics):
+    """OCR results in page order, one rendered chunk at a time."""
+    for chunk in metrics.timed("rasterize_wait", chunks):
+        # map keeps results in page order; the rasterizer renders the
+        # next chunk while this one is being OCRed
+        with metrics.stage("ocr_chunk", first_page=chunk[0][0], pages=len(chunk)):
+            results = pool.map(ocr, chunk) if pool else list(map(ocr, chunk))
+        yield from results
+
+
+def write_page(html, page_num, image_name, text, words_name=None):
+    """
+    image_name is None for pages read from the PDF's text layer; their word
+    boxes are in words_name.
+    """
     html.write(f"<div class='page'>\n")
     html.write(f"<h2>Page {page_num}</h2>\n")
-    html.write(f"<img src='pages/{image_name}'><br>\n")
-    html.write("<h3>OCR Text</h3>\n")
+    if image_name is None:
+        html.write("<h3>PDF Text</h3>\n")
+        if words_name:
+            html.write(f"<a href='pages/{words_name}'>word boxes</a>\n")
+    else:
+        html.write(f"<img src='pages/{image_name}'><br>\n")
+        html.write("<h3>OCR Text</h3>\n")
     html.write("<pre>\n")
     html.write(text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
     html.write("\n</pre>\n")
     html.write("</div>\n")
 
-html.write("</body></html>")
-html.close()
 
-print(f"\nDone. Open {html_path} in your browser.")
+def write_text_pages(html, text_pages, before, total_pages):
+    """
+    Write the text-layer pages numbered below `before` (and drop them);
+    their word boxes go to PAGES_DIR, next to the page images.
+    """
+    for page_num in sorted(p for p in text_pages if p < before):
+        page = text_pages.pop(page_num)
+        words_name = f"{os.path.splitext(PAGE_NAME.format(page_num))[0]}.words.json"
+        with open(os.path.join(PAGES_DIR, words_name), "w", encoding="utf-8") as f:
+            json.dump(page, f, ensure_ascii=False)
+        write_page(html, page_num, None, "\n".join(page_lines(page)), words_name)
+        print(f"Processed page {page_num}/{total_pages} (text layer)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming Tesseract OCR of the Janes PDF")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of processes OCRing pages concurrently"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE,
+        help="pages rendered per pdftoppm process"
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=MAX_IN_FLIGHT,
+        help="cap on rendered pages waiting for OCR"
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true",
+        help="run rendering, OCR and writing as concurrent stages joined by "
+             "bounded queues (--workers sets the OCR stage)"
+    )
+    parser.add_argument(
+        "--render-workers", type=int, default=1,
+        help="pdftoppm processes rendering concurrently (--pipeline)"
+    )
+    parser.add_argument(
+        "--save-workers", type=int, default=1,
+        help="threads moving page images into the output (--pipeline)"
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=QUEUE_SIZE,
+        help="pages waiting between two stages (--pipeline)"
+    )
+    add_adaptive_args(parser, low_dpi=DPI)
+    add_triage_args(parser)
+    add_text_layer_args(parser)
+    add_engine_args(parser)
+    add_guard_args(parser)
+    add_metrics_args(parser)
+    args = parser.parse_args()
+    settings = engine_settings(args)
+    # one budget per page across all of its tesseract calls; past it the
+    # page is retried
+    settings["timeout"] = args.page_timeout
+    configure(settings)
+
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    work_dir = os.path.join(OUTPUT_DIR, ".adaptive")
+
+    html_path = os.path.join(OUTPUT_DIR, "output.html")
+
+    total_pages = page_count(PDF_FILE)
+
+    print(f"Total pages to process: {total_pages} ({args.workers} worker(s), "
+          f"{backend_name(args.backend)} engine)")
+
+    pages = None
+    if args.triage:
+        # tesseract has no structure mode; table pages get plain OCR too
+        decisions = triage(PDF_FILE, last_page=total_pages, log_file=args.triage_log)
+        pages = pages_for(decisions, {OCR, STRUCTURE})
+        print(summary(decisions))
+
+    # ({page_num: text-layer page}, pages to OCR) per window of pages; with
+    # --text-layer the PDF's text is read and classified one window ahead
+    # of rasterizing it, so only that window's word boxes are held
+    windows = [({}, pages)]
+    if args.text_layer:
+        windows = iter_split(PDF_FILE, last_page=total_pages, pages=pages,
+                             window=args.max_in_flight, log_file=args.sources_log)
+    n_text = n_ocr = 0
+
+    if args.adaptive:
+        os.makedirs(work_dir, exist_ok=True)
+        ocr = partial(ocr_page_adaptive, {
+            "low_dpi": args.low_dpi,
+            "high_dpi": args.high_dpi,
+            "min_confidence": args.min_confidence,
+            "mode": args.escalate,
+            "work_dir": work_dir,
+        })
+        escalations = EscalationReport()
+    else:
+        ocr = ocr_page
+
+    dpi = args.low_dpi if args.adaptive else DPI
+    ocr = partial(ocr_page_guarded, ocr, fallback_dpi(dpi, args.fallback_dpi))
+    failures = PageFailures()
+
+    # each worker builds its own engine once and keeps it for every page
+    pool = Pool(
+        args.workers, initializer=configure, initargs=(settings,)
+    ) if args.workers > 1 else None
+
+    scratch = None
+    if args.pipeline:
+        # pages are rendered to scratch space (tmpfs when available) and
+        # moved into PAGES_DIR by the save stage while later pages are OCRed
+        scratch = scratch_dir()
+
+        def render(first, last):
+            return render_chunk(PDF_FILE, dpi, first, last, scratch)
+
+        def ocr_stage(page):
+            page_num, image_name, text, stats = pool.apply(ocr, (page,)) if pool else ocr(page)
+            stats["path"] = page[1]
+            return page_num, image_name, text, stats
+
+    with instrument(args, "extract_streaming") as metrics, \
+            open(html_path, "w", encoding="utf-8") as html:
+        html.write(HTML_HEAD)
+
+        for text_pages, pages in windows:
+            if args.text_layer:
+                n_text += len(text_pages)
+                n_ocr += len(pages)
+            if args.pipeline:
+                results = metrics.timed("pipeline_wait", run_pipeline(
+                    page_runs(1, total_pages, args.chunk_size, pages),
+                    render,
+                    ocr_stage,
+                    save_page_image,
+                    render_workers=args.render_workers,
+                    ocr_workers=args.workers,
+                    save_workers=args.save_workers,
+                    max_in_flight=args.max_in_flight,
+                    queue_size=args.queue_size,
+                ))
+            else:
+                chunks = iter_page_chunks(
+                    PDF_FILE,
+                    dpi,
+                    out_dir=PAGES_DIR,
+                    chunk_size=args.chunk_size,
+                    max_in_flight=args.max_in_flight,
+                    last_page=total_pages,
+                    pages=pages,
+                )
+                results = chunked_results(chunks, ocr, pool, metrics)
+
+            for page_num, image_name, text, stats in results:
+                # text-layer pages are written in order between the OCRed ones
+                write_text_pages(html, text_pages, page_num, total_pages)
+                if "failed" in stats:
+                    failures.add(page_num, stats["failed"])
+                    metrics.add("ocr_page", stats["wall_s"], page=page_num, failed=True)
+                    print(f"Page {page_num}/{total_pages} failed: {'; '.join(stats['failed'])}")
+                    continue
+                if stats["attempt"] != "full":
+                    failures.recover(page_num, stats["attempt"], stats.pop("errors"))
+
+                labels = {"page": page_num, "chars": len(text), "attempt": stats["attempt"]}
+                if "escalation" in stats:
+                    escalations.add(stats["escalation"])
+                    labels["escalated"] = stats["escalation"]["escalated"]
+                metrics.add("ocr_page", stats["wall_s"], **labels)
+                if "save_s" in stats:
+                    metrics.add("image_save", stats["save_s"], page=page_num)
+                print(f"Processed page {page_num}/{total_pages}")
+                with metrics.accumulate("html_write"):
+                    write_page(html, page_num, image_name, text)
+
+            write_text_pages(html, text_pages, total_pages + 1, total_pages)
+        html.write("</body></html>")
+
+    if pool:
+        pool.close()
+        pool.join()
+    if scratch:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.text_layer:
+        print(sources_summary(n_text, n_ocr))
+    failures.write(args.failure_report)
+    print(failures.report(args.failure_report))
+
+    if args.adaptive:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        print(escalations.report())
+
+    print(f"\nDone. Open {html_path} in your browser.")
+
+
+if __name__ == "__main__":
+    main()
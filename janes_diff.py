@@ -0,0 +1,275 @@
+import re
+import json
+import argparse
+from collections import defaultdict
+
+from janes_records import iter_platforms
+from pipeline_metrics import add_metrics_args, instrument
+
+# -------------------------
+# CONFIG
+# -------------------------
+OUTPUT_FILE = "edition_changes.json"
+
+MIN_SCORE = 0.5          # class / ship-name similarity needed to link two records
+MAX_BLOCK = 50           # blocks larger than this are too generic to compare within
+
+COUNT_RE = re.compile(r"^\s*\d+\s+")                 # "4 DAMEN ..." → "DAMEN ..."
+ROLE_RE = re.compile(r"\(([A-Z]{2,6}(?:/[A-Z]{2,6})*)\)\s*$")   # "... CLASS (PB)", "(WAGH/AHH)"
+TOKEN_RE = re.compile(r"[A-Z0-9]+")
+CLASS_STOP = {"CLASS", "TYPE", "THE", "AND", "OF"}
+
+
+# -------------------------
+# KEYS
+# -------------------------
+def class_tokens(platform_class):
+    """Significant tokens of a PLATFORM_CLASS, without count and role suffix."""
+    text = COUNT_RE.sub("", (platform_class or "").upper())
+    text = ROLE_RE.sub("", text)
+    return frozenset(t for t in TOKEN_RE.findall(text) if t not in CLASS_STOP)
+
+
+def class_role(platform_class):
+    """The role code suffix ("PBFG"), or None."""
+    m = ROLE_RE.search((platform_class or "").upper())
+    return m.group(1) if m else None
+
+
+def class_count(platform_class):
+    m = COUNT_RE.match(platform_class or "")
+    return int(m.group()) if m else None
+
+
+def country_key(country):
+    return (country or "").strip().lower()
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class Entry:
+    __slots__ = ("index", "platform", "country", "tokens", "role", "names")
+
+    def __init__(self, index, platform):
+        self.index = index
+        self.platform = platform
+        self.country = country_key(platform.country)
+        self.tokens = class_tokens(platform.platform_class)
+        self.role = class_role(platform.platform_class)
+        self.names = frozenset(platform.names)
+
+    def exact_keys(self):
+        """Keys of an unchanged record, strictest first."""
+        p = self.platform
+        return (
+            (self.country, p.class_of_ship, p.platform_class, self.names),
+            (self.country, p.platform_class, self.names),
+        )
+
+    def block_keys(self):
+        """Exact class key, each class token and each ship name, within the country."""
+        yield ("class", self.country, self.tokens)
+        for t in self.tokens:
+            yield ("token", self.country, t)
+        for n in self.names:
+            yield ("ship", self.country, n)
+
+
+def score(a, b):
+    """
+    Class similarity, halved for a different role code, averaged with the
+    ship-name overlap. A ship list on one side only counts as no overlap.
+    """
+    s = jaccard(a.tokens, b.tokens)
+    if a.role and b.role and a.role != b.role:
+        s /= 2
+    if a.names or b.names:
+        s = (s + jaccard(a.names, b.names)) / 2
+    return s
+
+
+# -------------------------
+# LINKING
+# -------------------------
+def link(old, new, min_score=MIN_SCORE, max_block=MAX_BLOCK):
+    """
+    One-to-one links between two editions' entries.
+
+    Records unchanged between the editions (same country, class and ship
+    names) are linked first, duplicates in order. Of the rest, only pairs
+    sharing a blocking key (same country and the same class key, a class
+    token or a ship name) are scored, so the work grows with the block
+    sizes instead of len(old) * len(new). Pairs are accepted best score
+    first; ties go to more shared ship names, then the closer position in
+    the book. Returns ([(old, new, score)], unmatched old, unmatched new).
+    """
+    links, used_old, used_new = [], set(), set()
+    for level in range(2):
+        exact = defaultdict(list)
+        for b in new:
+            if b.index not in used_new:
+                exact[b.exact_keys()[level]].append(b)
+        for a in old:
+            if a.index in used_old:
+                continue
+            same = exact.get(a.exact_keys()[level])
+            if same:
+                b = same.pop(0)
+                used_old.add(a.index)
+                used_new.add(b.index)
+                links.append((a, b, 1.0))
+
+    blocks = defaultdict(list)
+    for e in new:
+        if e.index in used_new:
+            continue
+        for key in e.block_keys():
+            blocks[key].append(e)
+
+    pairs = {}
+    for a in old:
+        if a.index in used_old:
+            continue
+        for key in a.block_keys():
+            members = blocks.get(key, ())
+            # exact class keys are always compared; generic tokens only in small blocks
+            if key[0] != "class" and len(members) > max_block:
+                continue
+            for b in members:
+                if (a.index, b.index) not in pairs:
+                    s = score(a, b)
+                    if s >= min_score:
+                        pairs[(a.index, b.index)] = (s, a, b)
+
+    def rank(pair):
+        s, a, b = pair
+        offset = abs(a.index / len(old) - b.index / len(new))
+        return -s, -len(a.names & b.names), offset, a.index, b.index
+
+    for s, a, b in sorted(pairs.values(), key=rank):
+        if a.index in used_old or b.index in used_new:
+            continue
+        used_old.add(a.index)
+        used_new.add(b.index)
+        links.append((a, b, s))
+
+    links.sort(key=lambda l: l[1].index)
+    return (
+        links,
+        [a for a in old if a.index not in used_old],
+        [b for b in new if b.index not in used_new],
+    )
+
+
+# -------------------------
+# CHANGE SET
+# -------------------------
+def summary_of(p):
+    return {
+        "COUNTRY_NAME": p.country,
+        "CLASS_OF_SHIP": p.class_of_ship,
+        "PLATFORM_CLASS": p.platform_class,
+        "PLATFORM_NAMES": p.names,
+    }
+
+
+def radar_names(p):
+    return {r.canonical or r.radar_name for r in p.radars if r.radar_name}
+
+
+def changes_of(a, b):
+    """Field-level differences of one linked pair; empty if nothing changed."""
+    old, new = a.platform, b.platform
+    changes = {}
+    for field, x, y in (
+        ("PLATFORM_CLASS", old.platform_class, new.platform_class),
+        ("CLASS_OF_SHIP", old.class_of_ship, new.class_of_ship),
+        ("COUNT", class_count(old.platform_class), class_count(new.platform_class)),
+    ):
+        if x != y:
+            changes[field] = {"old": x, "new": y}
+
+    for field, x, y in (
+        ("SHIPS", set(old.names), set(new.names)),
+        ("RADARS", radar_names(old), radar_names(new)),
+    ):
+        if x != y:
+            changes[field] = {"added": sorted(y - x), "removed": sorted(x - y)}
+    return changes
+
+
+def diff_editions(old_path, new_path, min_score=MIN_SCORE):
+    old = [Entry(i, p) for i, p in enumerate(iter_platforms(old_path))]
+    new = [Entry(i, p) for i, p in enumerate(iter_platforms(new_path))]
+    links, removed, added = link(old, new, min_score)
+
+    modified = []
+    for a, b, s in links:
+        changes = changes_of(a, b)
+        if changes:
+            modified.append({
+                "COUNTRY_NAME": b.platform.country,
+                "PLATFORM_CLASS": b.platform.platform_class,
+                "match_score": round(s, 3),
+                "changes": changes,
+            })
+
+    ships_added = sum(len(m["changes"].get("SHIPS", {}).get("added", [])) for m in modified)
+    ships_removed = sum(len(m["changes"].get("SHIPS", {}).get("removed", [])) for m in modified)
+    ships_added += sum(len(b.platform.names) for b in added)
+    ships_removed += sum(len(a.platform.names) for a in removed)
+
+    return {
+        "old": old_path,
+        "new": new_path,
+        "summary": {
+            "old_classes": len(old),
+            "new_classes": len(new),
+            "linked": len(links),
+            "added": len(added),
+            "removed": len(removed),
+            "modified": len(modified),
+            "ships_added": ships_added,
+            "ships_removed": ships_removed,
+        },
+        "added": [summary_of(b.platform) for b in added],
+        "removed": [summary_of(a.platform) for a in removed],
+        "modified": modified,
+    }
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Year-over-year changes between two Janes edition outputs"
+    )
+    parser.add_argument("--old", required=True, help="earlier edition, .json or .jsonl records")
+    parser.add_argument("--new", required=True, help="later edition, .json or .jsonl records")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE,
+                        help="similarity needed to treat two classes as the same")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    with instrument(args, "janes_diff") as metrics:
+        with metrics.stage("diff") as labels:
+            result = diff_editions(args.old, args.new, args.min_score)
+            labels.update(result["summary"])
+        with metrics.stage("write"):
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+
+    s = result["summary"]
+    print(f"{s['linked']} classes linked, {s['added']} added, {s['removed']} removed, "
+          f"{s['modified']} modified; ships +{s['ships_added']} / -{s['ships_removed']}")
+    print(f"Change set written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import argparse
+from multiprocessing import Pool
+
+from janes_stream import load_elements, iter_slice_elements, section_ranges
+from janes_profiles import PROFILES
+from janes_records import Platform, json_default
+from pipeline_metrics import add_metrics_args, instrument
+
+# -------------------------
+# CONFIG
+# -------------------------
+HTML_FILE = "Janes 2023-2024 (1).htm"
+OUT_DIR = "profiles_output"
+PARSER = "stream"  # "stream" (constant memory) or "soup" (full BeautifulSoup tree)
+
+
+# -------------------------
+# ENGINE
+# -------------------------
+def run_profiles(html_file, profiles, parser=PARSER, metrics=None):
+    """
+    Walk the document once and feed every element to each profile.
+    Returns {profile.name: records}.
+    """
+    elements = load_elements(html_file, parser)
+
+    if metrics is None or not metrics.enabled:
+        for elem in elements:
+            for profile in profiles:
+                profile.feed(elem)
+    else:
+        for elem in metrics.timed("html_parse", elements):
+            for profile in profiles:
+                with metrics.accumulate(f"profile:{profile.name}"):
+                    profile.feed(elem)
+
+    return {profile.name: profile.finish() for profile in profiles}
+
+
+def country_of(record):
+    return record.country if isinstance(record, Platform) else record.get("COUNTRY_NAME")
+
+
+def extract_section(task):
+    """Run fresh profiles over one country slice (pool worker)."""
+    html_file, start, end, stack, names = task
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    profiles = [PROFILES[name]() for name in names]
+
+    for elem in iter_slice_elements(html_file, start, end, stack):
+        for profile in profiles:
+            profile.feed(elem)
+
+    results = {profile.name: profile.finish() for profile in profiles}
+
+    records = results[names[0]] if names else []
+    stats = {
+        "wall_s": time.perf_counter() - wall,
+        "cpu_s": time.process_time() - cpu,
+        "country": country_of(records[0]) if records else None,
+        "bytes": end - start,
+        "records": len(records),
+    }
+    return results, stats
+
+
+def iter_sharded(html_file, names, workers, metrics=None):
+    """
+    Pre-scan the font8 country boundaries, extract each country in a pool
+    worker and yield the per-section results in document order.
+
+    Every profile resets its state at a font8 span, so concatenating the
+    sections reproduces the single-pass output.
+    """
+    if metrics is None:
+        sections = section_ranges(html_file)
+    else:
+        with metrics.stage("section_prescan"):
+            sections = section_ranges(html_file)
+
+    tasks = [(html_file, start, end, stack, names) for start, end, stack in sections]
+    with Pool(workers) as pool:
+        for results, stats in pool.imap(extract_section, tasks):
+            if metrics is not None:
+                metrics.add("extract_country", stats.pop("wall_s"), stats.pop("cpu_s"), **stats)
+            yield results
+
+
+def run_profiles_sharded(html_file, names, workers, metrics=None):
+    results = {name: [] for name in names}
+    for part in iter_sharded(html_file, names, workers, metrics):
+        for name in names:
+            results[name].extend(part[name])
+    return results
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=json_default)
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run several extraction profiles over one parse of the Janes HTML"
+    )
+    parser.add_argument("--html", default=HTML_FILE)
+    parser.add_argument("--out-dir", default=OUT_DIR,
+                        help="each profile writes <out-dir>/<profile>.json")
+    parser.add_argument("--profiles", default=",".join(PROFILES),
+                        help=f"comma-separated subset of: {', '.join(PROFILES)}")
+    parser.add_argument("--parser", default=PARSER, choices=["stream", "soup"])
+    parser.add_argument("--workers", type=int, default=1,
+                        help="extract country sections in parallel processes")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.profiles.split(",") if n.strip()]
+    unknown = [n for n in names if n not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profile(s): {', '.join(unknown)}")
+
+    with instrument(args, "janes_engine") as metrics:
+        with metrics.stage("extract", profiles=names, workers=args.workers):
+            if args.workers > 1:
+                results = run_profiles_sharded(args.html, names, args.workers, metrics)
+            else:
+                profiles = [PROFILES[n]() for n in names]
+                results = run_profiles(args.html, profiles, args.parser, metrics)
+
+        os.makedirs(args.out_dir, exist_ok=True)
+        for name, data in results.items():
+            path = os.path.join(args.out_dir, f"{name}.json")
+            with metrics.stage("json_write", profile=name, records=len(data)):
+                write_json(path, data)
+            print(f"{name}: {len(data)} records → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import re
+import json
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+FILTERS_FILE = "janes_filters.json"
+
+
+# -------------------------
+# MATCHER
+# -------------------------
+class TokenMatcher:
+    """
+    Substring matcher over a fixed token vocabulary, compiled once into a
+    single alternation regex so each candidate is scanned in one pass
+    instead of once per token.
+
+    match(text) is equivalent to any(tok in text for tok in tokens); callers
+    pass text already upper-cased, like the filters it replaces.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = frozenset(tokens)
+        if self.tokens:
+            # longest first, so the alternation never stops on a prefix
+            alternation = "|".join(
+                re.escape(t) for t in sorted(self.tokens, key=lambda t: (-len(t), t))
+            )
+            self._search = re.compile(alternation).search
+        else:
+            self._search = lambda text: None
+
+    def match(self, text):
+        return self._search(text) is not None
+
+    def __contains__(self, text):
+        return self.match(text)
+
+    def __len__(self):
+        return len(self.tokens)
+
+
+# -------------------------
+# CONFIG FILE
+# -------------------------
+def load_filter_config(path=FILTERS_FILE):
+    """
+    Extra filter vocabulary, e.g.
+        {"BAD_NAME_TOKENS": ["TUG"], "KNOWN_RADAR_VENDORS": ["KELVIN HUGHES"]}
+    Values are merged into the built-in sets. A missing file means no extras.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    return {name: {str(tok).upper() for tok in tokens} for name, tokens in raw.items()}
@@ -0,0 +1,272 @@
+import os
+import json
+import hashlib
+import argparse
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from janes_engine import extract_section
+from janes_filters import FILTERS_FILE
+from radar_catalog import CATALOG_FILE
+from janes_io import iter_records, RecordWriter
+from janes_profiles import RawProfile
+from janes_stream import section_extents
+from janes_pipeline import local_modules
+from normalize_janes import normalize_entry
+from pipeline_metrics import Metrics, add_metrics_args, instrument
+
+# -------------------------
+# CONFIG
+# -------------------------
+HTML_FILE = "Janes 2023-2024 (1).htm"
+RAW_FILE = "raw_extracted.json"
+OUTPUT_FILE = "final_output.json"
+MANIFEST_FILE = "sections_manifest.json"
+HASH_CHUNK = 1 << 20
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# -------------------------
+# HASHING
+# -------------------------
+def hash_section(f, start, end, stack):
+    """Hash of the bytes a slice extraction reads, and the tags open at its start."""
+    h = hashlib.sha256("/".join(stack).encode("ascii") + b"\0")
+    f.seek(start)
+    remaining = end - start
+    while remaining:
+        chunk = f.read(min(HASH_CHUNK, remaining))
+        if not chunk:
+            break
+        h.update(chunk)
+        remaining -= len(chunk)
+    return h.hexdigest()
+
+
+def code_fingerprint():
+    """
+    Hash of this script, every repo module it imports (directly or not) and
+    the filter / catalog configs; a change to any of them invalidates every
+    section.
+    """
+    h = hashlib.sha256()
+    code = local_modules(os.path.basename(__file__))
+    paths = [os.path.join(REPO_DIR, p) for p in code] + [FILTERS_FILE, CATALOG_FILE]
+    for path in paths:
+        h.update(path.encode("utf-8") + b"\0")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def scan(html_file):
+    """[(start, end, stack, hash), ...] for every font8 section in order."""
+    sections = []
+    with open(html_file, "rb") as f:
+        for start, end, stack, read_end in section_extents(html_file):
+            sections.append((start, end, stack, hash_section(f, start, read_end, stack)))
+    return sections
+
+
+# -------------------------
+# MANIFEST
+# -------------------------
+def load_manifest(path, raw_file, output_file, fingerprint):
+    """The previous run's manifest, or None if it cannot be reused."""
+    if not os.path.exists(path):
+        return None
+    if not (os.path.exists(raw_file) and os.path.exists(output_file)):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("code") != fingerprint:
+        return None
+    if manifest.get("raw_file") != raw_file or manifest.get("output_file") != output_file:
+        return None
+    return manifest
+
+
+def tmp_path(path):
+    # keep the extension so RecordWriter still picks .json vs .jsonl
+    root, ext = os.path.splitext(path)
+    return root + ".tmp" + ext
+
+
+def write_manifest(path, manifest):
+    tmp = tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class PreviousRun:
+    """
+    The records of the previous run, grouped back into sections using the
+    per-section counts in its manifest.
+
+    take(hash) reads ahead through the old outputs only as far as the
+    matching section, so when sections keep their order (the usual case)
+    only one section is held in memory at a time.
+    """
+
+    def __init__(self, manifest):
+        self.sections = iter(manifest["sections"] if manifest else [])
+        self.raw = iter_records(manifest["raw_file"]) if manifest else iter(())
+        self.final = iter_records(manifest["output_file"]) if manifest else iter(())
+        self.remaining = {}
+        for s in manifest["sections"] if manifest else []:
+            self.remaining[s["hash"]] = self.remaining.get(s["hash"], 0) + 1
+        self.buffered = {}
+
+    def take(self, digest):
+        """(raw records, final records) of an unchanged section, or None."""
+        if not self.remaining.get(digest) and not self.buffered.get(digest):
+            return None
+
+        while not self.buffered.get(digest):
+            s = next(self.sections)
+            raw = list(islice(self.raw, s["raw"]))
+            final = list(islice(self.final, s["final"]))
+            self.remaining[s["hash"]] -= 1
+            self.buffered.setdefault(s["hash"], deque()).append((raw, final))
+
+        return self.buffered[digest].popleft()
+
+
+# -------------------------
+# UPDATE
+# -------------------------
+def normalize_section(raw):
+    return [r.to_dict() for r in map(normalize_entry, raw) if r is not None]
+
+
+def extract_changed(html_file, changed, workers):
+    """Yield (raw, final) for each changed section, in order."""
+    tasks = [(html_file, start, end, stack, [RawProfile.name])
+             for start, end, stack, _ in changed]
+
+    if workers > 1 and len(tasks) > 1:
+        with Pool(workers) as pool:
+            for results, stats in pool.imap(extract_section, tasks):
+                raw = results[RawProfile.name]
+                yield raw, normalize_section(raw), stats
+    else:
+        for task in tasks:
+            results, stats = extract_section(task)
+            raw = results[RawProfile.name]
+            yield raw, normalize_section(raw), stats
+
+
+def update(html_file, raw_file, output_file, manifest_file, workers=1, full=False, metrics=None):
+    """
+    Bring raw_file / output_file up to date with html_file, re-extracting
+    and re-normalizing only the country sections whose content changed
+    since the run recorded in manifest_file.
+    Returns (manifest entries of all sections, entries of the changed ones).
+    """
+    if metrics is None:
+        metrics = Metrics(enabled=False)
+    fingerprint = code_fingerprint()
+
+    with metrics.stage("section_scan") as labels:
+        sections = scan(html_file)
+        labels["sections"] = len(sections)
+
+    manifest = None if full else load_manifest(manifest_file, raw_file, output_file, fingerprint)
+    previous = PreviousRun(manifest)
+
+    # a section is unchanged if the previous run had one with the same hash
+    # (duplicates only as often as they occurred before)
+    available = dict(previous.remaining)
+    changed = []
+    for s in sections:
+        if available.get(s[3]):
+            available[s[3]] -= 1
+        else:
+            changed.append(s)
+
+    fresh = extract_changed(html_file, changed, workers)
+    changed_starts = {s[0] for s in changed}
+    entries = []
+    updated = []
+
+    with metrics.stage("update", changed=len(changed)), \
+            RecordWriter(tmp_path(raw_file)) as raw_out, \
+            RecordWriter(tmp_path(output_file)) as final_out:
+        for start, end, stack, digest in sections:
+            if start in changed_starts:
+                raw, final, stats = next(fresh)
+                metrics.add("extract_country", stats.pop("wall_s"), stats.pop("cpu_s"), **stats)
+            else:
+                raw, final = previous.take(digest)
+
+            for record in raw:
+                raw_out.write(record)
+            for record in final:
+                final_out.write(record)
+
+            entry = {
+                "hash": digest,
+                "start": start,
+                "end": end,
+                "country": raw[0].get("COUNTRY_NAME") if raw else None,
+                "raw": len(raw),
+                "final": len(final),
+            }
+            entries.append(entry)
+            if start in changed_starts:
+                updated.append(entry)
+
+    os.replace(tmp_path(raw_file), raw_file)
+    os.replace(tmp_path(output_file), output_file)
+    write_manifest(manifest_file, {
+        "html": html_file,
+        "code": fingerprint,
+        "raw_file": raw_file,
+        "output_file": output_file,
+        "sections": entries,
+    })
+    return entries, updated
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-extract and re-normalize only the changed country sections"
+    )
+    parser.add_argument("--html", default=HTML_FILE)
+    parser.add_argument("--raw", default=RAW_FILE,
+                        help="raw records, .json array or .jsonl")
+    parser.add_argument("--output", default=OUTPUT_FILE,
+                        help="normalized records, .json array or .jsonl")
+    parser.add_argument("--manifest", default=MANIFEST_FILE,
+                        help="per-section hashes and record counts of the last run")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="extract changed sections in parallel processes")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the manifest and reprocess every section")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    with instrument(args, "janes_incremental") as metrics:
+        sections, changed = update(args.html, args.raw, args.output, args.manifest,
+                                   args.workers, args.full, metrics)
+
+    print(f"{len(changed)} of {len(sections)} sections re-extracted.")
+    for entry in changed[:20]:
+        print(f"  {entry['country'] or '(front matter)'}: {entry['raw']} raw / "
+              f"{entry['final']} normalized records")
+    if len(changed) > 20:
+        print(f"  ... and {len(changed) - 20} more")
+    print(f"Raw records → {args.raw}, normalized records → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
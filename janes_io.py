@@ -0,0 +1,120 @@
+import json
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+READ_CHUNK = 1 << 16
+
+
+def is_jsonl(path):
+    return path.lower().endswith(JSONL_SUFFIXES)
+
+
+# -------------------------
+# READING
+# -------------------------
+def _iter_json_array(f):
+    """Decode the top-level array of a .json file one element at a time."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    started = False
+
+    while True:
+        # skip separators
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                break
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return
+            buf, pos = chunk, 0
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("expected a JSON array of records")
+            started = True
+            pos += 1
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    raise
+                buf = buf[pos:] + chunk
+                pos = 0
+
+        yield obj
+        buf, pos = buf[end:], 0
+
+
+def iter_records(path):
+    """
+    Yield records one at a time from a JSON array (.json) or JSON Lines
+    (.jsonl / .ndjson) file without loading the whole file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if is_jsonl(path):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(f)
+
+
+# -------------------------
+# WRITING
+# -------------------------
+class RecordWriter:
+    """
+    Write records as they are produced.
+
+    JSON Lines output is flushed per record so consumers can tail it while
+    the run is in progress. JSON output is byte-identical to
+    json.dump(records, f, indent=2, ensure_ascii=False) but never holds
+    more than one record in memory.
+    """
+
+    def __init__(self, path, keep_head=0):
+        self.path = path
+        self.jsonl = is_jsonl(path)
+        self.keep_head = keep_head
+        self.head = []
+        self.count = 0
+        self.f = None
+
+    def __enter__(self):
+        self.f = open(self.path, "w", encoding="utf-8")
+        return self
+
+    def write(self, record):
+        if self.jsonl:
+            self.f.write(json.dumps(record, ensure_ascii=False))
+            self.f.write("\n")
+            self.f.flush()
+        else:
+            self.f.write("[\n  " if self.count == 0 else ",\n  ")
+            self.f.write(
+                json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+            )
+
+        if len(self.head) < self.keep_head:
+            self.head.append(record)
+        self.count += 1
+
+    def __exit__(self, *exc):
+        if not self.jsonl:
+            self.f.write("\n]" if self.count else "[]")
+        self.f.close()
+        return False
@@ -0,0 +1,349 @@
+import os
+import ast
+import sys
+import glob
+import json
+import time
+import shlex
+import hashlib
+import argparse
+import subprocess
+
+from janes_filters import FILTERS_FILE
+from radar_catalog import CATALOG_FILE
+from pipeline_metrics import Metrics, add_metrics_args, instrument
+
+# -------------------------
+# CONFIG
+# -------------------------
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = ".pipeline_state.json"
+HASH_CHUNK = 1 << 20
+
+HTML_FILE = "Janes 2023-2024 (1).htm"
+PDF_FILE = "janes10.pdf"
+RAW_FILE = "raw_extracted.json"
+OUTPUT_FILE = "final_output.json"
+TEXT_DIR = "output/text"
+MERGED_FILE = "output/janes10_full.txt"
+COLUMNAR_DIR = "columnar"
+COLUMNAR_FORMAT = "parquet"
+DB_FILE = "janes.db"
+
+GROUPS = {
+    "html": ["extract", "normalize", "export", "store"],
+    "ocr": ["ocr", "merge"],
+}
+DEFAULT_TARGETS = ["html"]
+
+
+# -------------------------
+# FINGERPRINTS
+# -------------------------
+def is_pattern(path):
+    return any(c in path for c in "*?[")
+
+
+class Hasher:
+    """
+    Content digests of files, reusing the digest recorded for a path while
+    its size and mtime are unchanged, so an untouched multi-hundred-MB
+    HTML book is not re-read on every run.
+    """
+
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+
+    def file(self, path):
+        st = os.stat(path)
+        known = self.known.get(path)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.known[path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def path(self, path):
+        """Digest of a file, a directory tree or a glob pattern; None if nothing is there."""
+        if is_pattern(path):
+            files = sorted(glob.glob(path))
+        elif os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path) for name in names
+            )
+        elif os.path.exists(path):
+            return self.file(path)
+        else:
+            return None
+
+        h = hashlib.sha256()
+        for f in files:
+            h.update(f.encode("utf-8") + b"\0" + self.file(f).encode("ascii"))
+        return h.hexdigest()
+
+
+def local_modules(script):
+    """The script and every repo module it imports, directly or not."""
+    seen = set()
+    todo = [os.path.join(REPO_DIR, script)]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names += [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.append(node.module)
+
+        for name in names:
+            top = name.split(".")[0]
+            module = os.path.join(REPO_DIR, top + ".py")
+            package = os.path.join(REPO_DIR, top)
+            if os.path.exists(module):
+                todo.append(module)
+            elif os.path.exists(os.path.join(package, "__init__.py")):
+                todo += glob.glob(os.path.join(package, "*.py"))
+
+    return sorted(os.path.relpath(p, REPO_DIR) for p in seen)
+
+
+# -------------------------
+# STAGES
+# -------------------------
+class Stage:
+    """
+    One script run. `args` (paths and settings) and the content of `inputs`
+    and of the script's code decide whether it must re-run; `optional`
+    inputs may be absent. `options` (worker counts) are passed through but
+    never invalidate a result.
+    """
+
+    def __init__(self, name, script, args, inputs, outputs, optional=(), options=()):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.inputs = list(inputs)
+        self.optional = list(optional)
+        self.outputs = list(outputs)
+        self.options = list(options)
+
+    def fingerprint(self, hasher):
+        return {
+            "code": {p: hasher.file(os.path.join(REPO_DIR, p))
+                     for p in local_modules(self.script)},
+            "args": self.args,
+            "inputs": {p: hasher.path(p) for p in self.inputs + self.optional},
+        }
+
+    def command(self):
+        return [sys.executable, os.path.join(REPO_DIR, self.script)] + self.args + self.options
+
+
+def build_stages(args):
+    workers = ["--workers", str(args.workers)] if args.workers > 1 else []
+    return [
+        Stage("extract", "extract_janes_raw.py",
+              ["--html", args.html, "--output", args.raw],
+              [args.html], [args.raw], options=workers),
+        Stage("normalize", "normalize_janes.py",
+              ["--input", args.raw, "--output", args.output],
+              [args.raw], [args.output], [FILTERS_FILE, CATALOG_FILE], workers),
+        Stage("export", "janes_records.py",
+              ["--input", args.output, "--out-dir", args.columnar_dir,
+               "--format", args.format],
+              [args.output], [args.columnar_dir]),
+        Stage("store", "janes_store.py",
+              ["--db", args.db, "build", "--input", args.output],
+              [args.output], [args.db]),
+        # rendering runs inside the OCR script, chunk by chunk alongside
+        # recognition; unchanged pages are served from its OCR cache
+        Stage("ocr", "paddle_ocr_10pages.py",
+              ["--pdf", args.pdf, "--text-dir", args.text_dir] + shlex.split(args.ocr_args),
+              [args.pdf], [args.text_dir]),
+        Stage("merge", "merge_txt.py",
+              ["--text-dir", args.text_dir, "--output", args.merged],
+              [os.path.join(args.text_dir, "*.txt")], [args.merged]),
+    ]
+
+
+def select(stages, targets):
+    """The targeted stages plus every stage producing one of their inputs, in order."""
+    names = set()
+    for t in targets:
+        names.update(GROUPS.get(t, [t]))
+
+    def produces(stage, path):
+        return any(path == out or path.startswith(os.path.join(out, ""))
+                   for out in stage.outputs)
+
+    wanted = set()
+    todo = [s for s in stages if s.name in names]
+    while todo:
+        s = todo.pop()
+        if s.name in wanted:
+            continue
+        wanted.add(s.name)
+        todo += [u for u in stages for path in s.inputs if produces(u, path)]
+    return [s for s in stages if s.name in wanted]
+
+
+def stale_reason(stage, fingerprint, record, hasher):
+    """Why a stage must run, or None if its recorded result still holds."""
+    if record is None:
+        return "never run"
+    for key, label in (("code", "code"), ("inputs", "input")):
+        changed = [p for p, d in fingerprint[key].items() if record[key].get(p) != d]
+        changed += [p for p in record[key] if p not in fingerprint[key]]
+        if changed:
+            return f"{label} changed: {', '.join(sorted(changed)[:3])}"
+    if fingerprint["args"] != record["args"]:
+        return "arguments changed"
+    for path in stage.outputs:
+        digest = hasher.path(path)
+        if digest is None:
+            return f"output missing: {path}"
+        if digest != record["outputs"].get(path):
+            return f"output modified: {path}"
+    return None
+
+
+# -------------------------
+# STATE
+# -------------------------
+def load_state(path):
+    if not os.path.exists(path):
+        return {"files": {}, "stages": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_state(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# -------------------------
+# RUN
+# -------------------------
+def run(stages, state_file, force=(), dry_run=False, metrics=None):
+    """
+    Run each stage whose code, arguments or input content changed since
+    its last successful run, in order. Inputs are hashed when a stage is
+    reached, so a re-run that writes identical output leaves the stages
+    after it untouched. Returns False if a stage failed.
+    """
+    if metrics is None:
+        metrics = Metrics(enabled=False)
+    state = load_state(state_file)
+    hasher = Hasher(state["files"])
+
+    for stage in stages:
+        fingerprint = stage.fingerprint(hasher)
+        record = state["stages"].get(stage.name)
+        reason = stale_reason(stage, fingerprint, record, hasher)
+        if stage.name in force:
+            reason = "forced"
+
+        if reason is None:
+            print(f"{stage.name:10} up to date")
+            continue
+        print(f"{stage.name:10} {reason}")
+        if dry_run:
+            continue
+
+        missing = [p for p in stage.inputs if not is_pattern(p) and hasher.path(p) is None]
+        if missing:
+            print(f"{stage.name:10} FAILED: input not found: {', '.join(missing)}")
+            return False
+
+        # a failed or interrupted run must not look current next time
+        state["stages"].pop(stage.name, None)
+        write_state(state_file, state)
+
+        print(f"{stage.name:10} $ {shlex.join(stage.command()[1:])}", flush=True)
+        start = time.perf_counter()
+        # CPU of the stage's process counts as this run's children
+        with metrics.stage(stage.name, reason=reason) as labels:
+            proc = subprocess.run(stage.command())
+            labels["exit"] = proc.returncode
+        wall = time.perf_counter() - start
+        if proc.returncode != 0:
+            print(f"{stage.name:10} FAILED (exit {proc.returncode}) after {wall:.1f}s")
+            return False
+
+        fingerprint["outputs"] = {p: hasher.path(p) for p in stage.outputs}
+        state["stages"][stage.name] = fingerprint
+        state["files"] = hasher.known
+        write_state(state_file, state)
+        print(f"{stage.name:10} done in {wall:.1f}s")
+
+    state["files"] = hasher.known
+    if not dry_run:
+        write_state(state_file, state)
+    return True
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the Janes pipeline, re-running only stages whose code, "
+                    "arguments or inputs changed"
+    )
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS,
+                        help="stages or groups to bring up to date (with the stages they "
+                             "depend on): html = extract, normalize, export, store; "
+                             "ocr = ocr, merge")
+    parser.add_argument("--html", default=HTML_FILE)
+    parser.add_argument("--pdf", default=PDF_FILE)
+    parser.add_argument("--raw", default=RAW_FILE,
+                        help="raw records, .json array or .jsonl")
+    parser.add_argument("--output", default=OUTPUT_FILE,
+                        help="normalized records, .json array or .jsonl")
+    parser.add_argument("--columnar-dir", default=COLUMNAR_DIR)
+    parser.add_argument("--format", default=COLUMNAR_FORMAT, choices=["parquet", "arrow"])
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--text-dir", default=TEXT_DIR, help="per-page OCR text")
+    parser.add_argument("--merged", default=MERGED_FILE, help="merged OCR text")
+    parser.add_argument("--ocr-args", default="",
+                        help="extra paddle_ocr_10pages.py arguments, e.g. '--adaptive'")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for extraction and normalization")
+    parser.add_argument("--state", default=STATE_FILE,
+                        help="fingerprints of the last successful run of each stage")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE",
+                        help="re-run this stage even if it is up to date (repeatable)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report which stages would run and why")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    stages = build_stages(args)
+    known = {s.name for s in stages} | set(GROUPS)
+    for name in args.targets + args.force:
+        if name not in known:
+            parser.error(f"unknown stage {name!r} (choose from {', '.join(sorted(known))})")
+
+    with instrument(args, "janes_pipeline") as metrics:
+        ok = run(select(stages, args.targets), args.state, set(args.force), args.dry_run, metrics)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
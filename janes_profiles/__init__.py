@@ -0,0 +1,9 @@
+from janes_profiles.raw import RawProfile
+from janes_profiles.high_coverage import HighCoverageProfile
+from janes_profiles.final_high_coverage import FinalHighCoverageProfile
+from janes_profiles.platform import PlatformProfile
+
+PROFILES = {
+    p.name: p
+    for p in (RawProfile, HighCoverageProfile, FinalHighCoverageProfile, PlatformProfile)
+}
@@ -0,0 +1,153 @@
+import re
+
+from janes_records import Platform, Radar
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+
+PENNANT_RE = re.compile(r"^[A-Z]?\s?\d+$")
+CLASS_SUFFIX_RE = re.compile(r"^\([A-Z0-9]+\)$")
+
+
+def clean(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def is_upper_candidate(text):
+    return text.isupper() and 3 < len(text) < 200
+
+
+def clean_platform_name(name):
+    name = clean(name)
+    if PENNANT_RE.match(name):
+        return None
+    return name
+
+
+def extract_table_names(table):
+    names = []
+    rows = table.find_all("tr")
+    for r in rows[1:]:
+        cols = r.find_all("td")
+        if cols:
+            n = clean_platform_name(cols[0].get_text())
+            if n:
+                names.append(n)
+    return names
+
+
+def extract_inline_names(text):
+    names = []
+    for part in re.split(r"\s{2,}", text):
+        part = clean_platform_name(part)
+        if part:
+            names.append(part)
+    return names
+
+
+def extract_radars(text):
+    radars = []
+    text = re.sub(r"Radars?:", "", text, flags=re.I)
+
+    for part in re.split(r"\.\s*", text):
+        if ":" not in part:
+            continue
+
+        rtype, rest = part.split(":", 1)
+        rtype = rtype.strip()
+
+        band = ""
+        low = rest.lower()
+        if "l-band" in low or "i-band" in low:
+            band = "I-band"
+        elif "e/f" in low:
+            band = "E/F-band"
+        elif "g-band" in low:
+            band = "G-band"
+
+        name = rest.split(";")[0].strip()
+
+        radars.append(Radar(rtype, name, band))
+
+    return radars
+
+
+# -------------------------
+# PROFILE
+# -------------------------
+class FinalHighCoverageProfile:
+    """Pennant-aware names and Radars:-paragraph parsing."""
+
+    name = "final_high_coverage"
+
+    def __init__(self):
+        self.output = []
+        self.current_country = None
+        self.current_platform_type = None
+        self.current_entry = None
+
+    def feed(self, el):
+
+        # -------- COUNTRY --------
+        if el.name == "span" and "font8" in (el.get("class") or []):
+            if self.current_entry:
+                self.output.append(self.current_entry)
+                self.current_entry = None
+
+            self.current_country = clean(el.get_text())
+            self.current_platform_type = None
+
+        # -------- PLATFORM TYPE --------
+        elif el.name == "span" and "font6" in (el.get("class") or []):
+            self.current_platform_type = clean(el.get_text())
+
+        # -------- PLATFORM CLASS --------
+        elif el.name == "span" and "font5" in (el.get("class") or []):
+            text = clean(el.get_text())
+
+            # CLASS SUFFIX → MERGE
+            if CLASS_SUFFIX_RE.match(text) and self.current_entry:
+                self.current_entry.platform_class += f" {text}"
+                return
+
+            # NEW CLASS
+            if self.current_entry:
+                self.output.append(self.current_entry)
+
+            self.current_entry = Platform(self.current_country, self.current_platform_type, text)
+
+        # -------- TABLE NAMES --------
+        elif el.name == "table" and self.current_entry:
+            names = extract_table_names(el)
+            if names:
+                self.current_entry.names.extend(names)
+
+        # -------- PARAGRAPHS --------
+        elif el.name == "p" and self.current_entry:
+            text = clean(el.get_text())
+
+            if re.search(r"\bradars?\b", text, re.I):
+                self.current_entry.radars.extend(extract_radars(text))
+
+            elif is_upper_candidate(text):
+                self.current_entry.names.extend(
+                    extract_inline_names(text)
+                )
+
+        # -------- IMAGES --------
+        elif el.name == "img" and self.current_entry:
+            src = el.get("src")
+            if src:
+                self.current_entry.img_paths.append(src)
+
+    def finish(self):
+        if self.current_entry:
+            self.output.append(self.current_entry)
+            self.current_entry = None
+
+        for o in self.output:
+            o.names = list(dict.fromkeys(o.names))
+
+        return self.output
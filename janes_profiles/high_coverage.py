@@ -0,0 +1,134 @@
+import re
+
+from janes_records import Platform, Radar
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def clean(txt):
+    return re.sub(r"\s+", " ", txt).strip()
+
+
+def clean_name(name):
+    name = re.sub(r"\(.*?\)", "", name)
+    name = re.sub(r"\b[PYA]\s?\d+\b", "", name)
+    return name.strip()
+
+
+def extract_uppercase_names(text):
+    candidates = re.findall(r"[A-Z][A-Z0-9'’\-]{2,}(?:\s+[A-Z0-9'’\-]{2,})*", text)
+    names = []
+    for c in candidates:
+        c = clean_name(c)
+        if len(c) >= 3 and not c.endswith("CLASS"):
+            names.append(c)
+    return names
+
+
+def extract_radars(text):
+    radars = []
+    parts = re.split(r"\.\s*", text)
+    for p in parts:
+        if not re.search(r"radar|search|navigation", p, re.I):
+            continue
+        band = ""
+        low = p.lower()
+        if "l-band" in low or "i-band" in low:
+            band = "I-band"
+        elif "e/f" in low:
+            band = "E/F-band"
+
+        name = p.split(":")[-1].split(";")[0].strip()
+        radars.append(Radar("Radar", name, band))
+    return radars
+
+
+def extract_table_names(table):
+    names = []
+    for row in table.find_all("tr")[1:]:
+        cols = row.find_all("td")
+        if cols:
+            name = clean_name(cols[0].get_text(strip=True))
+            if name:
+                names.append(name)
+    return names
+
+
+# -------------------------
+# PROFILE
+# -------------------------
+class HighCoverageProfile:
+    """Aggressive uppercase-name and loose radar detection."""
+
+    name = "high_coverage"
+
+    def __init__(self):
+        self.data = []
+        self.current_country = None
+        self.current_platform_type = None
+        self.current_entry = None
+        self.last_font5 = False
+
+    def feed(self, el):
+
+        # COUNTRY
+        if el.name == "span" and "font8" in (el.get("class") or []):
+            if self.current_entry:
+                self.data.append(self.current_entry)
+                self.current_entry = None
+            self.current_country = clean(el.get_text())
+            self.current_platform_type = None
+
+        # PLATFORM TYPE
+        elif el.name == "span" and "font6" in (el.get("class") or []):
+            self.current_platform_type = clean(el.get_text())
+
+        # PLATFORM CLASS
+        elif el.name == "span" and "font5" in (el.get("class") or []):
+            text = clean(el.get_text())
+
+            if self.current_entry and self.last_font5 and text.startswith("("):
+                self.current_entry.platform_class += f" {text}"
+            else:
+                if self.current_entry:
+                    self.data.append(self.current_entry)
+                self.current_entry = Platform(self.current_country, self.current_platform_type, text)
+            self.last_font5 = True
+            return
+
+        self.last_font5 = False
+
+        # TABLE NAMES
+        if el.name == "table" and self.current_entry:
+            names = extract_table_names(el)
+            self.current_entry.names.extend(names)
+
+        # PARAGRAPHS (AGGRESSIVE)
+        elif el.name == "p" and self.current_entry:
+            text = clean(el.get_text())
+
+            # PLATFORM NAMES (uppercase blocks)
+            if text.isupper() and len(text) < 300:
+                self.current_entry.names.extend(extract_uppercase_names(text))
+
+            # RADARS (loose detection)
+            if re.search(r"radar|search|navigation", text, re.I):
+                self.current_entry.radars.extend(extract_radars(text))
+
+        # IMAGES
+        elif el.name == "img" and self.current_entry:
+            src = el.get("src")
+            if src:
+                self.current_entry.img_paths.append(src)
+
+    def finish(self):
+        if self.current_entry:
+            self.data.append(self.current_entry)
+            self.current_entry = None
+
+        # FINAL CLEANUP
+        for d in self.data:
+            d.names = sorted(set(n for n in d.names if n))
+
+        return self.data
@@ -0,0 +1,155 @@
+import re
+
+from janes_records import Platform, Radar
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def clean_ship_name(name):
+    name = re.sub(r"\(.*?\)", "", name)
+    name = re.sub(r"\b[PYA]\s?\d+\b", "", name)
+    return name.strip()
+
+
+def normalize_platform_class(text):
+    # drop role-only suffixes like "(PB)"
+    return re.sub(r"\s*\((PB|PBR|PBX|PBF)\)\s*$", "", text).strip()
+
+
+def normalize_band(text):
+    t = text.lower()
+    band_match = re.search(r"([a-z]/[a-z]|[a-z])-band", t)
+    if band_match:
+        return band_match.group(0).upper()
+    if "i-band" in t or "l-band" in t:
+        return "I-band"
+    return ""
+
+
+def extract_inline_names(text):
+    raw = re.findall(r"[A-Z][A-Z0-9'’\-]+(?:\s[A-Z0-9'’\-]+)*", text)
+    cleaned = []
+    for r in raw:
+        n = clean_ship_name(r)
+        if n and not n.endswith("CLASS"):
+            cleaned.append(n)
+    return cleaned
+
+
+def extract_radars(text):
+    radars = []
+
+    # remove leading keywords if present
+    text = re.sub(r"Radars?:", "", text, flags=re.I)
+
+    # split on sentences
+    parts = re.split(r"\.\s*", text)
+
+    for part in parts:
+        if ":" in part:
+            rtype, rest = part.split(":", 1)
+            band = normalize_band(rest)
+
+            # radar names can be numbered or empty
+            names = re.split(r"\d+\s+", rest)
+            if not names:
+                radars.append(Radar(rtype.strip(), "", band))
+            else:
+                for n in names:
+                    name = n.split(";")[0].strip()
+                    radars.append(Radar(rtype.strip(), name, band))
+    return radars
+
+
+# -------------------------
+# PROFILE
+# -------------------------
+class PlatformProfile:
+    """Band-aware radar splitting and role-suffix stripping."""
+
+    name = "platform"
+
+    def __init__(self):
+        self.data = []
+        self.current_country = None
+        self.current_class_of_ship = None
+        self.current_entry = None
+        self.last_was_font5 = False
+
+    def feed(self, elem):
+
+        # -------- COUNTRY --------
+        if elem.name == "span" and "font8" in (elem.get("class") or []):
+            if self.current_entry:
+                self.data.append(self.current_entry)
+                self.current_entry = None
+            self.current_country = elem.get_text(strip=True)
+            self.current_class_of_ship = None
+            self.last_was_font5 = False
+
+        # -------- CLASS OF SHIP --------
+        elif elem.name == "span" and "font6" in (elem.get("class") or []):
+            self.current_class_of_ship = elem.get_text(strip=True)
+            self.last_was_font5 = False
+
+        # -------- PLATFORM CLASS --------
+        elif elem.name == "span" and "font5" in (elem.get("class") or []):
+            text = elem.get_text(strip=True)
+
+            if self.current_entry and self.last_was_font5:
+                self.current_entry.platform_class += f" {text}"
+            else:
+                if self.current_entry:
+                    self.data.append(self.current_entry)
+                self.current_entry = Platform(
+                    self.current_country,
+                    self.current_class_of_ship,
+                    normalize_platform_class(text),
+                )
+
+            self.last_was_font5 = True
+            return
+
+        # -------- TABLE PLATFORM NAMES --------
+        elif elem.name == "table" and self.current_entry:
+            for row in elem.find_all("tr")[1:]:
+                cols = row.find_all("td")
+                if cols:
+                    name = clean_ship_name(cols[0].get_text(strip=True))
+                    if name:
+                        self.current_entry.names.append(name)
+            self.last_was_font5 = False
+
+        # -------- PARAGRAPHS --------
+        elif elem.name == "p" and self.current_entry:
+            text = elem.get_text(" ", strip=True)
+
+            # RADARS (heuristic, not keyword-only)
+            if any(k in text.lower() for k in ["radar", "search", "navigation"]):
+                self.current_entry.radars.extend(extract_radars(text))
+
+            # INLINE PLATFORM NAMES
+            elif text.isupper() and len(text) < 200:
+                self.current_entry.names.extend(
+                    extract_inline_names(text)
+                )
+
+            self.last_was_font5 = False
+
+        # -------- IMAGES --------
+        elif elem.name == "img" and self.current_entry:
+            src = elem.get("src")
+            if src:
+                self.current_entry.img_paths.append(src)
+            self.last_was_font5 = False
+
+    def finish(self):
+        if self.current_entry:
+            self.data.append(self.current_entry)
+            self.current_entry = None
+
+        for d in self.data:
+            d.names = sorted(set(n for n in d.names if n))
+
+        return self.data
@@ -0,0 +1,112 @@
+import re
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def clean_text(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def extract_table(table):
+    rows = []
+    for tr in table.find_all("tr"):
+        cells = [clean_text(td.get_text(" ")) for td in tr.find_all(["td", "th"])]
+        if cells:
+            rows.append(cells)
+    return rows
+
+
+# -------------------------
+# PROFILE
+# -------------------------
+class RawProfile:
+    """
+    Raw platform blocks (RAW_TEXT / IMG_PATH) for normalize_janes.py.
+    With a sink, each block is handed over as soon as it is complete
+    instead of being collected.
+    """
+
+    name = "raw"
+
+    def __init__(self, sink=None):
+        self.data = []
+        self.sink = sink
+        self.current_country = None
+        self.current_class_of_ship = None
+        self.current_entry = None
+        self.last_font5 = False
+
+    def flush_entry(self):
+        if self.current_entry:
+            if self.sink:
+                self.sink(self.current_entry)
+            else:
+                self.data.append(self.current_entry)
+            self.current_entry = None
+
+    def feed(self, elem):
+
+        # -------- COUNTRY (font8) --------
+        if elem.name == "span" and "font8" in (elem.get("class") or []):
+            self.flush_entry()
+            self.current_country = clean_text(elem.get_text())
+            self.current_class_of_ship = None
+            self.last_font5 = False
+            return
+
+        # -------- CLASS OF SHIP (font6) --------
+        if elem.name == "span" and "font6" in (elem.get("class") or []):
+            self.current_class_of_ship = clean_text(elem.get_text())
+            self.last_font5 = False
+            return
+
+        # -------- PLATFORM CLASS (font5) --------
+        if elem.name == "span" and "font5" in (elem.get("class") or []):
+            text = clean_text(elem.get_text())
+
+            # Merge consecutive font5 spans (e.g. "(PB)")
+            if self.current_entry and self.last_font5:
+                self.current_entry["PLATFORM_CLASS"] += " " + text
+            else:
+                self.flush_entry()
+                self.current_entry = {
+                    "COUNTRY_NAME": self.current_country,
+                    "CLASS_OF_SHIP": self.current_class_of_ship,
+                    "PLATFORM_CLASS": text,
+                    "RAW_TEXT": [],
+                    "IMG_PATH": []
+                }
+
+            self.last_font5 = True
+            return
+
+        # -------- TABLE --------
+        if elem.name == "table" and self.current_entry:
+            table_data = extract_table(elem)
+            if table_data:
+                self.current_entry["RAW_TEXT"].append({
+                    "TABLE": table_data
+                })
+            self.last_font5 = False
+            return
+
+        # -------- PARAGRAPH --------
+        if elem.name == "p" and self.current_entry:
+            text = clean_text(elem.get_text(" "))
+            if text:
+                self.current_entry["RAW_TEXT"].append(text)
+            self.last_font5 = False
+            return
+
+        # -------- IMAGE --------
+        if elem.name == "img" and self.current_entry:
+            src = elem.get("src")
+            if src:
+                self.current_entry["IMG_PATH"].append(src)
+            self.last_font5 = False
+            return
+
+    def finish(self):
+        self.flush_entry()
+        return self.data
@@ -0,0 +1,271 @@
+import os
+import sys
+import argparse
+
+from janes_io import iter_records
+from pipeline_metrics import add_metrics_args, instrument
+
+# -------------------------
+# CONFIG
+# -------------------------
+INPUT_FILE = "final_output.json"
+OUT_DIR = "columnar"
+FORMAT = "parquet"       # "parquet" or "arrow" (Feather v2 / Arrow IPC)
+BATCH_SIZE = 5000        # platforms per row group / record batch
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def _intern(value):
+    # low-cardinality fields repeat thousands of times; share one copy
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _paths(img):
+    """IMG_PATH as a list whichever shape the extractor wrote."""
+    if img is None:
+        return []
+    if isinstance(img, str):
+        return [img]
+    return list(img)
+
+
+# -------------------------
+# RECORDS
+# -------------------------
+class Radar:
+    __slots__ = ("radar_type", "radar_name", "band_type", "canonical")
+
+    def __init__(self, radar_type, radar_name, band_type, canonical=None):
+        self.radar_type = _intern(radar_type)
+        self.radar_name = radar_name
+        self.band_type = _intern(band_type)
+        self.canonical = _intern(canonical)
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d.get("RADAR_TYPE"), d.get("RADAR_NAME"), d.get("BAND_TYPE"),
+                   d.get("RADAR_CANONICAL"))
+
+    def __reduce__(self):
+        # rebuilt through __init__ so a pool worker's records are interned
+        # in the receiving process too
+        return Radar, (self.radar_type, self.radar_name, self.band_type, self.canonical)
+
+    def to_dict(self):
+        d = {
+            "RADAR_TYPE": self.radar_type,
+            "RADAR_NAME": self.radar_name,
+            "BAND_TYPE": self.band_type,
+        }
+        # only present when normalized against a radar catalog
+        if self.canonical is not None:
+            d["RADAR_CANONICAL"] = self.canonical
+        return d
+
+
+class Platform:
+    """
+    One platform class entry, as built by the extraction profiles and the
+    normalizer and read back by the store, export and diff tools.
+    Serialized by to_dict(): PLATFORM_NAMES (never "PLATFORM NAMES") and
+    IMG_PATH always a list.
+    """
+
+    __slots__ = ("country", "class_of_ship", "platform_class", "names", "radars", "img_paths")
+
+    def __init__(self, country, class_of_ship, platform_class, names=(), radars=(), img_paths=()):
+        self.country = _intern(country)
+        self.class_of_ship = _intern(class_of_ship)
+        self.platform_class = platform_class
+        self.names = list(names)
+        self.radars = list(radars)
+        self.img_paths = list(img_paths)
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d.get("COUNTRY_NAME"),
+            d.get("CLASS_OF_SHIP"),
+            d.get("PLATFORM_CLASS"),
+            d.get("PLATFORM_NAMES", d.get("PLATFORM NAMES")) or [],
+            [Radar.from_dict(r) for r in d.get("RADARS") or []],
+            _paths(d.get("IMG_PATH")),
+        )
+
+    def __reduce__(self):
+        return Platform, (self.country, self.class_of_ship, self.platform_class,
+                          self.names, self.radars, self.img_paths)
+
+    def to_dict(self):
+        return {
+            "COUNTRY_NAME": self.country,
+            "CLASS_OF_SHIP": self.class_of_ship,
+            "PLATFORM_CLASS": self.platform_class,
+            "PLATFORM_NAMES": self.names,
+            "RADARS": [r.to_dict() for r in self.radars],
+            "IMG_PATH": self.img_paths,
+        }
+
+
+def json_default(obj):
+    """json.dump(default=...) hook: Platform / Radar objects as their dicts, one at a time."""
+    if isinstance(obj, (Platform, Radar)):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def iter_platforms(path):
+    """Platform objects streamed from a .json / .jsonl records file."""
+    for record in iter_records(path):
+        yield Platform.from_dict(record)
+
+
+# -------------------------
+# COLUMNAR EXPORT
+# -------------------------
+def _schemas(pa):
+    text = pa.dictionary(pa.int32(), pa.string())
+    platforms = pa.schema([
+        ("platform_id", pa.int64()),
+        ("country", text),
+        ("class_of_ship", text),
+        ("platform_class", pa.string()),
+        ("platform_names", pa.list_(pa.string())),
+        ("img_paths", pa.list_(pa.string())),
+    ])
+    radars = pa.schema([
+        ("platform_id", pa.int64()),
+        ("radar_type", text),
+        ("radar_name", pa.string()),
+        ("band_type", text),
+        ("radar_canonical", text),
+    ])
+    return platforms, radars
+
+
+class _Dictionary:
+    """
+    One dictionary-encoded column across batches. Values keep their index
+    and new ones are appended, so each batch's dictionary extends the last
+    one (an Arrow IPC file accepts deltas but not replacements).
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def encode(self, pa, values):
+        indices = []
+        for v in values:
+            if v is None:
+                indices.append(None)
+                continue
+            i = self.index.get(v)
+            if i is None:
+                i = self.index[v] = len(self.values)
+                self.values.append(v)
+            indices.append(i)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, pa.int32()), pa.array(self.values, pa.string())
+        )
+
+
+def _batches(platforms, size):
+    batch = []
+    for p in platforms:
+        batch.append(p)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_columnar(platforms, out_dir=OUT_DIR, fmt=FORMAT, batch_size=BATCH_SIZE):
+    """
+    Write platforms.<ext> and radars.<ext> (child table keyed by platform_id)
+    one batch at a time. Low-cardinality columns are dictionary-encoded.
+    Returns (platform rows, radar rows).
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise SystemExit("Columnar export needs pyarrow: pip install pyarrow")
+
+    platform_schema, radar_schema = _schemas(pa)
+    ext = "parquet" if fmt == "parquet" else "arrow"
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, f"{name}.{ext}") for name in ("platforms", "radars")]
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writers = [pq.ParquetWriter(paths[0], platform_schema),
+                   pq.ParquetWriter(paths[1], radar_schema)]
+    else:
+        import pyarrow.ipc as ipc
+        options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        writers = [ipc.new_file(paths[0], platform_schema, options=options),
+                   ipc.new_file(paths[1], radar_schema, options=options)]
+
+    dicts = {name: _Dictionary() for name in
+             ("country", "class_of_ship", "radar_type", "band_type", "radar_canonical")}
+
+    n_platforms = n_radars = 0
+    try:
+        for batch in _batches(platforms, batch_size):
+            ids = range(n_platforms, n_platforms + len(batch))
+            writers[0].write_table(pa.Table.from_pydict({
+                "platform_id": list(ids),
+                "country": dicts["country"].encode(pa, [p.country for p in batch]),
+                "class_of_ship": dicts["class_of_ship"].encode(pa, [p.class_of_ship for p in batch]),
+                "platform_class": [p.platform_class for p in batch],
+                "platform_names": [p.names for p in batch],
+                "img_paths": [p.img_paths for p in batch],
+            }, schema=platform_schema))
+
+            radars = [(pid, r) for pid, p in zip(ids, batch) for r in p.radars]
+            writers[1].write_table(pa.Table.from_pydict({
+                "platform_id": [pid for pid, _ in radars],
+                "radar_type": dicts["radar_type"].encode(pa, [r.radar_type for _, r in radars]),
+                "radar_name": [r.radar_name for _, r in radars],
+                "band_type": dicts["band_type"].encode(pa, [r.band_type for _, r in radars]),
+                "radar_canonical": dicts["radar_canonical"].encode(pa, [r.canonical for _, r in radars]),
+            }, schema=radar_schema))
+
+            n_platforms += len(batch)
+            n_radars += len(radars)
+    finally:
+        for w in writers:
+            w.close()
+
+    return n_platforms, n_radars
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export Janes records to Parquet / Arrow (platforms + radars tables)"
+    )
+    parser.add_argument("--input", default=INPUT_FILE,
+                        help="records, .json array or .jsonl")
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    parser.add_argument("--format", default=FORMAT, choices=["parquet", "arrow"])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    with instrument(args, "janes_records") as metrics, \
+            metrics.stage("export", format=args.format) as labels:
+        n_platforms, n_radars = export_columnar(
+            iter_platforms(args.input), args.out_dir, args.format, args.batch_size
+        )
+        labels.update(platforms=n_platforms, radars=n_radars)
+    print(f"{n_platforms} platforms, {n_radars} radars → {args.out_dir}/ ({args.format})")
+
+
+if __name__ == "__main__":
+    main()
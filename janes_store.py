@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import sqlite3
+import argparse
+
+from janes_records import iter_platforms
+from pipeline_metrics import add_metrics_args, instrument
+
+# -------------------------
+# CONFIG
+# -------------------------
+INPUT_FILE = "final_output.json"
+DB_FILE = "janes.db"
+
+SCHEMA = """
+CREATE TABLE platforms (
+    id INTEGER PRIMARY KEY,
+    country TEXT,
+    class_of_ship TEXT,
+    platform_class TEXT,
+    img_path TEXT
+);
+CREATE TABLE platform_names (
+    platform_id INTEGER REFERENCES platforms(id),
+    name TEXT
+);
+CREATE TABLE radars (
+    platform_id INTEGER REFERENCES platforms(id),
+    radar_type TEXT,
+    radar_name TEXT,
+    band TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX idx_platforms_country ON platforms(country COLLATE NOCASE);
+CREATE INDEX idx_platforms_class_of_ship ON platforms(class_of_ship COLLATE NOCASE, country);
+CREATE INDEX idx_names_name ON platform_names(name COLLATE NOCASE);
+CREATE INDEX idx_names_platform ON platform_names(platform_id);
+CREATE INDEX idx_radars_name ON radars(radar_name COLLATE NOCASE);
+CREATE INDEX idx_radars_platform ON radars(platform_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE platforms_fts USING fts5(
+    country, class_of_ship, platform_class, names, radars
+);
+"""
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def has_fts5(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+# -------------------------
+# BUILD
+# -------------------------
+def build(input_file, db_file):
+    """(Re)build the store from a .json or .jsonl output; returns the record count."""
+    tmp = db_file + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    conn = sqlite3.connect(tmp)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript(SCHEMA)
+    fts = has_fts5(conn)
+    if fts:
+        conn.executescript(FTS_SCHEMA)
+
+    count = 0
+    with conn:
+        for pid, p in enumerate(iter_platforms(input_file), 1):
+            conn.execute(
+                "INSERT INTO platforms VALUES (?, ?, ?, ?, ?)",
+                (pid, p.country, p.class_of_ship, p.platform_class,
+                 p.img_paths[0] if p.img_paths else None)
+            )
+            conn.executemany(
+                "INSERT INTO platform_names VALUES (?, ?)",
+                [(pid, name) for name in p.names]
+            )
+            conn.executemany(
+                "INSERT INTO radars VALUES (?, ?, ?, ?)",
+                [(pid, r.radar_type, r.radar_name, r.band_type) for r in p.radars]
+            )
+            if fts:
+                conn.execute(
+                    "INSERT INTO platforms_fts(rowid, country, class_of_ship, platform_class, "
+                    "names, radars) VALUES (?, ?, ?, ?, ?, ?)",
+                    (pid, p.country or "", p.class_of_ship or "", p.platform_class or "",
+                     " | ".join(p.names), " | ".join(r.radar_name or "" for r in p.radars))
+                )
+            count += 1
+
+    conn.executescript(INDEXES)
+    conn.execute("ANALYZE")
+    conn.close()
+    os.replace(tmp, db_file)
+    return count
+
+
+# -------------------------
+# QUERY
+# -------------------------
+def query(conn, country=None, class_of_ship=None, radar=None, name=None, text=None, limit=100):
+    """
+    Platforms matching every given filter.
+    country / class_of_ship / name are exact (case-insensitive) index lookups;
+    radar and text are full-text phrase matches when FTS5 is available,
+    substring matches otherwise.
+    """
+    where, params = [], []
+    fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'platforms_fts'"
+    ).fetchone() is not None
+
+    if country:
+        where.append("p.country = ? COLLATE NOCASE")
+        params.append(country)
+    if class_of_ship:
+        where.append("p.class_of_ship = ? COLLATE NOCASE")
+        params.append(class_of_ship)
+    if name:
+        where.append("p.id IN (SELECT platform_id FROM platform_names "
+                     "WHERE name = ? COLLATE NOCASE)")
+        params.append(name)
+    if radar:
+        if fts:
+            where.append("p.id IN (SELECT rowid FROM platforms_fts WHERE radars MATCH ?)")
+            params.append(fts_phrase(radar))
+        else:
+            where.append("p.id IN (SELECT platform_id FROM radars WHERE radar_name LIKE ?)")
+            params.append(f"%{radar}%")
+    if text:
+        if fts:
+            where.append("p.id IN (SELECT rowid FROM platforms_fts WHERE platforms_fts MATCH ?)")
+            params.append(fts_phrase(text))
+        else:
+            where.append("(p.platform_class LIKE ? OR p.country LIKE ? OR p.class_of_ship LIKE ?)")
+            params += [f"%{text}%"] * 3
+
+    sql = "SELECT id, country, class_of_ship, platform_class, img_path FROM platforms p"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id LIMIT ?"
+    params.append(limit)
+
+    results = []
+    for pid, c, cos, pc, img in conn.execute(sql, params).fetchall():
+        names = [n for (n,) in conn.execute(
+            "SELECT name FROM platform_names WHERE platform_id = ?", (pid,))]
+        radars = [
+            {"RADAR_TYPE": t, "RADAR_NAME": n, "BAND_TYPE": b}
+            for t, n, b in conn.execute(
+                "SELECT radar_type, radar_name, band FROM radars WHERE platform_id = ?", (pid,))
+        ]
+        results.append({
+            "COUNTRY_NAME": c,
+            "CLASS_OF_SHIP": cos,
+            "PLATFORM_CLASS": pc,
+            "PLATFORM_NAMES": names,
+            "RADARS": radars,
+            "IMG_PATH": [img] if img else [],
+        })
+    return results
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Indexed query store over extracted platforms")
+    parser.add_argument("--db", default=DB_FILE)
+    add_metrics_args(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="build the store from extractor output")
+    b.add_argument("--input", default=INPUT_FILE, help=".json or .jsonl records")
+
+    q = sub.add_parser("query", help="look platforms up")
+    q.add_argument("--country")
+    q.add_argument("--class-of-ship")
+    q.add_argument("--radar", help="radar name phrase, e.g. 'JRC JMA5310'")
+    q.add_argument("--name", help="exact ship name")
+    q.add_argument("--text", help="phrase anywhere in the record")
+    q.add_argument("--limit", type=int, default=100)
+    q.add_argument("--json", action="store_true", help="print full records as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        with instrument(args, "janes_store") as metrics, metrics.stage("build") as labels:
+            count = labels["records"] = build(args.input, args.db)
+        print(f"Indexed {count} records into {args.db} in {time.perf_counter() - start:.2f}s")
+        return
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} not found; run `build` first")
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    start = time.perf_counter()
+    with instrument(args, "janes_store") as metrics, metrics.stage("query") as labels:
+        results = query(conn, args.country, args.class_of_ship, args.radar,
+                        args.name, args.text, args.limit)
+        labels["results"] = len(results)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        for r in results:
+            radars = ", ".join(x["RADAR_NAME"] for x in r["RADARS"])
+            print(f"{r['COUNTRY_NAME']} | {r['CLASS_OF_SHIP']} | {r['PLATFORM_CLASS']} | "
+                  f"{', '.join(r['PLATFORM_NAMES'])} | {radars}")
+    print(f"{len(results)} result(s) in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
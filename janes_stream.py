@@ -0,0 +1,416 @@
+import io
+import os
+import re
+import mmap
+import html
+import codecs
+from html.entities import html5
+from html.parser import HTMLParser
+from collections import deque
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+STREAM_TAGS = ("span", "p", "table", "img")
+CHUNK_SIZE = 1 << 20
+CONTINUE_SIZE = 1 << 12   # read-ahead step past a slice end
+
+# Mirrors BeautifulSoup's html.parser tree builder so the stream matches
+# soup.find_all(...) element for element.
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+}
+HIDDEN_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+PRESERVE_WS_TAGS = {"pre", "textarea"}
+ASCII_SPACES = " \n\t\f\r"     # only these collapse; "&nbsp;" is text
+# bs4's entity table: whole names only, so "&copy2023" stays literal
+ENTITIES = {}
+for _name, _char in sorted(html5.items()):
+    ENTITIES.setdefault(_name.rstrip(";"), _char)
+NUMERIC_REF_RE = re.compile(r"^(x[0-9a-f]+|[0-9]+)(.*)$", re.I | re.S)
+
+
+# -------------------------
+# ELEMENT
+# -------------------------
+class Element:
+    """
+    Detached element holding only its own subtree.
+    Supports the slice of the BeautifulSoup Tag API the extractors use:
+    .name, .get(), .get_text() and .find_all().
+    """
+
+    __slots__ = ("name", "attrs", "contents", "closed", "hidden")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.contents = []
+        self.closed = False
+        self.hidden = name in HIDDEN_TEXT_TAGS
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def _strings(self):
+        for child in self.contents:
+            if isinstance(child, str):
+                yield child
+            elif not child.hidden:
+                yield from child._strings()
+
+    def _descendants(self):
+        for child in self.contents:
+            if not isinstance(child, str):
+                yield child
+                yield from child._descendants()
+
+    def get_text(self, separator="", strip=False):
+        strings = self._strings()
+        if strip:
+            strings = (s.strip() for s in strings)
+            strings = (s for s in strings if s)
+        return separator.join(strings)
+
+    def find_all(self, name):
+        names = {name} if isinstance(name, str) else set(name)
+        return [el for el in self._descendants() if el.name in names]
+
+    def __repr__(self):
+        return f"<Element {self.name} {self.attrs!r}>"
+
+
+# -------------------------
+# PARSER
+# -------------------------
+class _StreamParser(HTMLParser):
+
+    def __init__(self, tags):
+        # references are resolved as bs4's tree builder does, not by html.unescape
+        super().__init__(convert_charrefs=False)
+        self.tags = set(tags)
+        self.stack = []          # [name, Element or None]
+        self.pending = deque()   # tracked elements in start-tag order
+        self.text = []
+        self.cutoff = False      # past the slice end: build, but don't emit
+        self.void_open = []      # void start tags a matching end tag may follow
+
+    def _flush_text(self):
+        if not self.text:
+            return
+        data = "".join(self.text)
+        self.text = []
+
+        if not self.stack or self.stack[-1][1] is None:
+            return
+        if not data.strip(ASCII_SPACES) and not any(
+            name in PRESERVE_WS_TAGS for name, _ in self.stack
+        ):
+            data = "\n" if "\n" in data else " "
+        self.stack[-1][1].contents.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+
+        parent = self.stack[-1][1] if self.stack else None
+        el = None
+        if parent is not None or tag in self.tags:
+            values = {}
+            for key, value in attrs:
+                values[key] = "" if value is None else value
+            if "class" in values:
+                values["class"] = values["class"].split()
+            el = Element(tag, values)
+            if parent is not None:
+                parent.contents.append(el)
+            if tag in self.tags and not self.cutoff:
+                self.pending.append(el)
+
+        if tag in VOID_TAGS:
+            if el is not None:
+                el.closed = True
+            self.void_open.append(tag)
+            return
+        self.stack.append([tag, el])
+
+    def handle_endtag(self, tag):
+        # "<br></br>": the end tag of a void element is dropped without
+        # splitting the surrounding text; any other end tag ends the
+        # current string, opened or not, as in bs4
+        if tag in self.void_open:
+            self.void_open.remove(tag)
+            return
+        self._flush_text()
+
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+
+        for _, el in self.stack[i:]:
+            if el is not None:
+                el.closed = True
+        del self.stack[i:]
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def handle_entityref(self, name):
+        self.text.append(ENTITIES.get(name, "&" + name))
+
+    def handle_charref(self, name):
+        # "&#65x" is "A" followed by the text "x"
+        m = NUMERIC_REF_RE.match(name)
+        if m is None:
+            self.text.append(name)
+            return
+        self.text.append(html.unescape(f"&#{m.group(1)};"))
+        self.text.append(m.group(2))
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_decl(self, decl):
+        self._flush_text()
+
+    def handle_pi(self, data):
+        self._flush_text()
+
+    def unknown_decl(self, data):
+        # bs4 keeps a CDATA section as a string of its own; any other
+        # <![...]> section is a Declaration, which get_text() skips
+        self._flush_text()
+        if data.upper().startswith("CDATA["):
+            self.text.append(data[len("CDATA["):])
+            self._flush_text()
+
+    def finish(self):
+        self.close()
+        self._flush_text()
+        for _, el in self.stack:
+            if el is not None:
+                el.closed = True
+        self.stack = []
+
+    def ready(self):
+        while self.pending and self.pending[0].closed:
+            yield self.pending.popleft()
+
+
+# -------------------------
+# PUBLIC API
+# -------------------------
+def iter_elements(html_file, tags=STREAM_TAGS, chunk_size=CHUNK_SIZE):
+    """
+    Incrementally parse html_file and yield the same elements, in the same
+    order, as BeautifulSoup(f, "html.parser").find_all(tags).
+
+    Each element is yielded as soon as it (and every tracked element that
+    started before it) has closed, so memory is bounded by the largest
+    tracked element rather than by the document.
+
+    One known difference: after a bare "&#" not followed by a digit,
+    html.parser waits for more input, and with bs4's single feed() the rest
+    of the document becomes text; fed in chunks, parsing resumes.
+    """
+    parser = _StreamParser(tags)
+
+    with open(html_file, "r", encoding="utf-8", errors="ignore") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from parser.ready()
+
+    parser.finish()
+    yield from parser.ready()
+
+
+def iter_slice_elements(html_file, start, end, stack=(), tags=STREAM_TAGS,
+                        chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of iter_elements(html_file) whose start tag lies in
+    the byte range [start, end).
+
+    stack holds the tag names open at `start` (from scan_sections), so end
+    tags resolve exactly as in a full parse. Elements still open at `end`
+    are completed by reading on past it without emitting anything new.
+    """
+    parser = _StreamParser(tags)
+    parser.stack = [[name, None] for name in stack]
+
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(errors="ignore"), translate=True
+    )
+
+    with open(html_file, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            data = f.read(min(chunk_size, end - pos))
+            if not data:
+                break
+            pos += len(data)
+            parser.feed(decoder.decode(data))
+            yield from parser.ready()
+
+        # the open elements usually close within a few bytes; small reads
+        # keep a slice from parsing a whole chunk of the next section
+        parser.cutoff = True
+        while parser.pending:
+            data = f.read(CONTINUE_SIZE)
+            if not data:
+                break
+            parser.feed(decoder.decode(data))
+            yield from parser.ready()
+
+        if parser.pending or not f.read(1):
+            parser.feed(decoder.decode(b"", final=True))
+            parser.finish()
+            yield from parser.ready()
+
+
+# -------------------------
+# SECTION PRE-SCAN
+# -------------------------
+TOKEN_RE = re.compile(
+    rb"<!--.*?-->"
+    rb"|<(/?)([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>",
+    re.S
+)
+CLASS_ATTR_RE = re.compile(
+    rb"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I
+)
+RAW_TEXT_TAGS = {b"script", b"style"}
+
+
+def _scan(html_file, marker):
+    """
+    Tag-only pass shared by scan_sections and section_extents. Returns the
+    boundaries as [(byte_offset, open_entries), ...], where each entry is
+    [name, open_offset, close_offset] and close_offset stays None for tags
+    that are never closed.
+    """
+    marker = marker.encode("ascii")
+    sections = [(0, [])]
+    stack = []
+
+    with open(html_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return sections
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            pos = 0
+            while True:
+                m = TOKEN_RE.search(buf, pos)
+                if not m:
+                    break
+                pos = m.end()
+                name = m.group(2)
+                if name is None:
+                    continue
+                name = name.lower()
+                attrs = m.group(3)
+
+                if m.group(1):
+                    for i in range(len(stack) - 1, -1, -1):
+                        if stack[i][0] == name:
+                            for entry in stack[i:]:
+                                entry[2] = m.end()
+                            del stack[i:]
+                            break
+                    continue
+
+                if name == b"span":
+                    cls = CLASS_ATTR_RE.search(attrs)
+                    if cls and marker in b"".join(v or b"" for v in cls.groups()).split():
+                        sections.append((m.start(), list(stack)))
+
+                if name.decode("ascii", "ignore") in VOID_TAGS or attrs.rstrip().endswith(b"/"):
+                    continue
+
+                if name in RAW_TEXT_TAGS:
+                    close = re.compile(rb"</" + name + rb"\s*>", re.I).search(buf, pos)
+                    pos = close.end() if close else len(buf)
+                    continue
+
+                stack.append([name, m.start(), None])
+        finally:
+            buf.close()
+
+    return sections
+
+
+def _names(entries):
+    return tuple(e[0].decode("ascii", "ignore") for e in entries)
+
+
+def scan_sections(html_file, marker="font8"):
+    """
+    Fast tag-only pass over the raw bytes (no tree, no text) that returns
+    [(byte_offset, open_tag_names), ...] for the document prefix and every
+    span.<marker> start tag, i.e. the country boundaries of the book.
+    """
+    return [(offset, _names(entries)) for offset, entries in _scan(html_file, marker)]
+
+
+def section_ranges(html_file, marker="font8"):
+    """[(start, end, open_tag_names), ...] covering the whole file in order."""
+    sections = scan_sections(html_file, marker)
+    size = os.path.getsize(html_file)
+    ends = [start for start, _ in sections[1:]] + [size]
+    return [
+        (start, end, stack)
+        for (start, stack), end in zip(sections, ends)
+        if end > start or start == 0
+    ]
+
+
+def section_extents(html_file, marker="font8", tags=STREAM_TAGS):
+    """
+    section_ranges plus, for each section, the offset up to which its
+    extraction reads: tracked elements opened in a section but still open
+    at its end (e.g. the <p> around the next country's span) are completed
+    from the following bytes, so those bytes belong to its content too.
+    Returns [(start, end, open_tag_names, read_end), ...].
+    """
+    sections = _scan(html_file, marker)
+    size = os.path.getsize(html_file)
+    tracked = {t.encode("ascii") for t in tags}
+    ends = [start for start, _ in sections[1:]] + [size]
+    nexts = [entries for _, entries in sections[1:]] + [[]]
+
+    extents = []
+    for (start, entries), end, open_at_end in zip(sections, ends, nexts):
+        if end <= start and start != 0:
+            continue
+        read_end = end
+        for name, opened, closed in open_at_end:
+            if name in tracked and opened >= start:
+                read_end = max(read_end, closed or size)
+        extents.append((start, end, _names(entries), read_end))
+    return extents
+
+
+def iter_soup_elements(html_file, tags=STREAM_TAGS):
+    """Legacy full-tree path, kept for parity checks against iter_elements."""
+    from bs4 import BeautifulSoup
+
+    with open(html_file, "r", encoding="utf-8", errors="ignore") as f:
+        soup = BeautifulSoup(f, "html.parser")
+    yield from soup.find_all(list(tags))
+
+
+def load_elements(html_file, parser="stream"):
+    if parser == "soup":
+        return iter_soup_elements(html_file)
+    if parser == "stream":
+        return iter_elements(html_file)
+    raise ValueError(f"Unknown parser: {parser}")
@@ -0,0 +1,151 @@
+import cv2
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+# PP-Structure layout labels worth recognizing; "figure" (ship photos) is not
+TEXT_TYPES = {"text", "title", "list", "table_caption", "figure_caption", "header", "footer"}
+TABLE_TYPES = {"table"}
+PAD = 4                 # pixels added around each region before cropping
+MIN_SIDE = 8            # regions thinner than this hold no readable text
+WIDE_REGION = 0.6       # share of the page width that makes a region full-width
+COLUMNS = 3             # column bands used for reading order
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def load_image(image):
+    """Page as a BGR array; accepts a path or an array already in memory."""
+    if isinstance(image, str):
+        img = cv2.imread(image)
+        if img is None:
+            raise ValueError(f"Could not read image {image}")
+        return img
+    return image
+
+
+def crop(img, bbox, pad=PAD):
+    h, w = img.shape[:2]
+    x0, y0, x1, y1 = (int(v) for v in bbox)
+    x0, y0 = max(0, x0 - pad), max(0, y0 - pad)
+    x1, y1 = min(w, x1 + pad), min(h, y1 + pad)
+    return img[y0:y1, x0:x1], (x0, y0)
+
+
+def reading_order(regions, page_width):
+    """
+    Top to bottom; between full-width regions, each column is read top to
+    bottom before the next (Janes pages are set in two or three columns).
+    """
+    ordered, band = [], []
+
+    def flush():
+        band.sort(key=lambda r: (
+            int((r["bbox"][0] + r["bbox"][2]) / 2 / page_width * COLUMNS), r["bbox"][1]
+        ))
+        ordered.extend(band)
+        band.clear()
+
+    for region in sorted(regions, key=lambda r: r["bbox"][1]):
+        x0, _, x1, _ = region["bbox"]
+        if x1 - x0 > WIDE_REGION * page_width:
+            flush()
+            ordered.append(region)
+        else:
+            band.append(region)
+    flush()
+    return ordered
+
+
+def area(bbox):
+    x0, y0, x1, y1 = bbox
+    return max(0, x1 - x0) * max(0, y1 - y0)
+
+
+# -------------------------
+# LAYOUT-FIRST OCR
+# -------------------------
+class LayoutOCR:
+    """
+    Layout analysis once per page, recognition only inside the regions
+    that can hold text; photographs and empty margins are never passed to
+    the text detector or recognizer.
+
+    layout(img) -> [{"type", "bbox"}, ...]    e.g. PPStructure(table=False, ocr=False)
+    ocr           a PaddleOCR instance, run det + rec on each text crop
+    table(img)  -> PPStructure result         e.g. PPStructure(layout=False); None
+                                              reads tables as plain text lines
+
+    run() returns the kept regions shaped like PPStructure output, {"type",
+    "bbox", "res"} with every coordinate in page pixels, and per-page stats.
+    """
+
+    def __init__(self, layout, ocr, table=None, text_types=TEXT_TYPES,
+                 table_types=TABLE_TYPES):
+        self.layout = layout
+        self.ocr = ocr
+        self.table = table
+        self.text_types = set(text_types)
+        self.table_types = set(table_types)
+
+    def read_text(self, img, bbox):
+        part, (dx, dy) = crop(img, bbox)
+        if min(part.shape[:2]) < MIN_SIDE:
+            return []
+
+        result = self.ocr.ocr(part, cls=True)
+        lines = []
+        if result and result[0]:
+            for box, (text, conf) in result[0]:
+                lines.append({
+                    "text": text,
+                    "confidence": float(conf),
+                    "text_region": [[float(x) + dx, float(y) + dy] for x, y in box],
+                })
+        return lines
+
+    def read_table(self, img, bbox):
+        part, _ = crop(img, bbox)
+        if min(part.shape[:2]) < MIN_SIDE:
+            return {}
+        for region in self.table(part):
+            if region.get("type") == "table":
+                return {"html": region.get("res", {}).get("html", "")}
+        return {}
+
+    def run(self, image):
+        """Returns {"regions": [...], "stats": {...}} for one page (JSON-safe)."""
+        img = load_image(image)
+        h, w = img.shape[:2]
+
+        found = [
+            {"type": r["type"], "bbox": [int(v) for v in r["bbox"]]}
+            for r in self.layout(img)
+        ]
+        wanted = self.text_types | self.table_types
+        kept = reading_order([r for r in found if r["type"] in wanted], w)
+
+        for region in kept:
+            if region["type"] in self.table_types and self.table is not None:
+                region["res"] = self.read_table(img, region["bbox"])
+            else:
+                region["res"] = self.read_text(img, region["bbox"])
+
+        stats = {
+            "regions": len(found),
+            "kept": len(kept),
+            "text_share": round(sum(area(r["bbox"]) for r in kept) / (w * h), 3) if w * h else 0,
+        }
+        return {"regions": kept, "stats": stats}
+
+
+def region_lines(regions):
+    """Plain text lines of LayoutOCR regions, in reading order."""
+    lines = []
+    for region in regions:
+        res = region.get("res")
+        if isinstance(res, list):
+            lines.extend(r["text"] for r in res)
+    return lines
@@ -1,11 +1,30 @@
+import argparse
 from pathlib import Path
 
+from pipeline_metrics import add_metrics_args, instrument
+
 text_dir = Path("output/text")
 out_file = Path("output/janes10_full.txt")
 
-with out_file.open("w", encoding="utf-8") as fout:
-    for txt in sorted(text_dir.glob("*.txt")):
-        fout.write(f"\n\n===== {txt.name} =====\n\n")
-        fout.write(txt.read_text(encoding="utf-8"))
 
-print("Merged output written to", out_file)
+def main():
+    parser = argparse.ArgumentParser(description="Merge per-page OCR text into one file")
+    parser.add_argument("--text-dir", type=Path, default=text_dir)
+    parser.add_argument("--output", type=Path, default=out_file)
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    with instrument(args, "merge_txt") as metrics, metrics.stage("merge") as labels:
+        pages = 0
+        with args.output.open("w", encoding="utf-8") as fout:
+            for txt in sorted(args.text_dir.glob("*.txt")):
+                fout.write(f"\n\n===== {txt.name} =====\n\n")
+                fout.write(txt.read_text(encoding="utf-8"))
+                pages += 1
+        labels["pages"] = pages
+
+    print("Merged output written to", args.output)
+
+
+if __name__ == "__main__":
+    main()
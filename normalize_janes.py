@@ -1,9 +1,26 @@
 import json
 import re
+import argparse
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from janes_io import iter_records, RecordWriter
+from pipeline_metrics import add_metrics_args, instrument
+from janes_filters import TokenMatcher, load_filter_config, FILTERS_FILE
+from radar_catalog import RadarCatalog, CATALOG_FILE
+from janes_records import Platform, Radar
 
 INPUT_FILE = "raw_extracted.json"
 OUTPUT_FILE = "final_output.json"
 
+# optional extra vocabulary, merged into the sets below
+FILTERS = load_filter_config(FILTERS_FILE)
+
+# canonical radar names; RADAR_CANONICAL is omitted without a catalog file
+# and for names the catalog does not know
+RADAR_CATALOG = RadarCatalog.load(CATALOG_FILE)
+
 # -------------------------
 # FILTERS & CONSTANTS
 # -------------------------
@@ -22,7 +39,7 @@ BAD_PLATFORM_CLASSES = {
     "AUXILIARIES",
     "COAST DEFENCE",
     "COAST DEFENSE",
-}
+} | FILTERS.get("BAD_PLATFORM_CLASSES", set())
 
 BAD_NAME_TOKENS = {
     "CLASS", "CRAFT", "BOATS", "BOAT",
@@ -32,39 +49,59 @@ BAD_NAME_TOKENS = {
     "SURVEY", "AIRCRAFT",
     "HELICOPTER", "SQUADRON",
     "WING", "FLIGHT"
-}
+} | FILTERS.get("BAD_NAME_TOKENS", set())
 
-RADAR_GARBAGE = {"L-", "K-", "F-", "G-", "X-", "BAND"}
+RADAR_GARBAGE = {"L-", "K-", "F-", "G-", "X-", "BAND"} | FILTERS.get("RADAR_GARBAGE", set())
 
 KNOWN_RADAR_VENDORS = {
     "RAYTHEON", "THALES", "SAAB", "INDRA",
     "SELEX", "LEONARDO", "LOCKHEED",
     "NORTHROP", "ELTA", "FURUNO",
     "JRC", "HENSOLDT"
-}
+} | FILTERS.get("KNOWN_RADAR_VENDORS", set())
+
+# -------------------------
+# COMPILED MATCHERS
+# -------------------------
+
+BAD_NAME_MATCHER = TokenMatcher(BAD_NAME_TOKENS)
+RADAR_GARBAGE_MATCHER = TokenMatcher(RADAR_GARBAGE)
+RADAR_VENDOR_MATCHER = TokenMatcher(KNOWN_RADAR_VENDORS)
+
+WS_RE = re.compile(r"\s+")
+PAREN_RE = re.compile(r"\(.*?\)")
+PENNANT_RE = re.compile(r"\b[PYA]\s?\d+\b")
+SHIP_NAME_CHARS_RE = re.compile(r"^[A-Z0-9'’\- ]+$")
+HAS_ALPHA_RE = re.compile(r"[A-Z]")
+HAS_DIGIT_RE = re.compile(r"\d")
+MULTI_SPACE_RE = re.compile(r"\s{2,}")
+CAPS_WORD_SPLIT_RE = re.compile(r"\s(?=[A-Z]{3,}\b)")
+RADARS_PREFIX_RE = re.compile(r"Radars?:", re.I)
+SENTENCE_SPLIT_RE = re.compile(r"\.\s*")
+RADAR_CANDIDATE_RE = re.compile(r"[A-Z][A-Z0-9\-]+(?:\s[A-Z0-9\-]+)*")
 
 # -------------------------
 # HELPERS
 # -------------------------
 
 def clean_text(text):
-    return re.sub(r"\s+", " ", text).strip()
+    return WS_RE.sub(" ", text).strip()
 
 
 def clean_name(name):
-    name = re.sub(r"\(.*?\)", "", name)
-    name = re.sub(r"\b[PYA]\s?\d+\b", "", name)
+    name = PAREN_RE.sub("", name)
+    name = PENNANT_RE.sub("", name)
     return clean_text(name)
 
 
 def looks_like_ship_name(name):
     if not name or len(name) < 3:
         return False
-    if any(tok in name.upper() for tok in BAD_NAME_TOKENS):
+    if BAD_NAME_MATCHER.match(name.upper()):
         return False
-    if not re.match(r"^[A-Z0-9'’\- ]+$", name):
+    if not SHIP_NAME_CHARS_RE.match(name):
         return False
-    if not re.search(r"[A-Z]", name):
+    if not HAS_ALPHA_RE.search(name):
         return False
     return True
 
@@ -78,13 +115,13 @@ def split_inline_names(text):
     """
     names = []
 
-    chunks = re.split(r"\s{2,}", text)
+    chunks = MULTI_SPACE_RE.split(text)
     for chunk in chunks:
         chunk = chunk.strip()
         if not chunk:
             continue
 
-        sub_chunks = re.split(r"\s(?=[A-Z]{3,}\b)", chunk)
+        sub_chunks = CAPS_WORD_SPLIT_RE.split(chunk)
         for sc in sub_chunks:
             n = clean_name(sc)
             if looks_like_ship_name(n):
@@ -107,11 +144,12 @@ def normalize_band(text):
 def valid_radar_name(name):
     if not name or len(name) < 3:
         return False
-    if any(g in name.upper() for g in RADAR_GARBAGE):
+    upper = name.upper()
+    if RADAR_GARBAGE_MATCHER.match(upper):
         return False
     # must have a digit OR known vendor
-    if not re.search(r"\d", name):
-        if not any(v in name.upper() for v in KNOWN_RADAR_VENDORS):
+    if not HAS_DIGIT_RE.search(name):
+        if not RADAR_VENDOR_MATCHER.match(upper):
             return False
     return True
 
@@ -157,8 +195,8 @@ def extract_radars(raw_text):
         if not item.lower().startswith("radars"):
             continue
 
-        text = re.sub(r"Radars?:", "", item, flags=re.I)
-        sentences = re.split(r"\.\s*", text)
+        text = RADARS_PREFIX_RE.sub("", item)
+        sentences = SENTENCE_SPLIT_RE.split(text)
 
         for sentence in sentences:
             if ":" not in sentence:
@@ -168,19 +206,13 @@ def extract_radars(raw_text):
             rtype = clean_text(rtype)
             band = normalize_band(rest)
 
-            candidates = re.findall(
-                r"[A-Z][A-Z0-9\-]+(?:\s[A-Z0-9\-]+)*",
-                rest
-            )
+            candidates = RADAR_CANDIDATE_RE.findall(rest)
 
             for c in candidates:
                 name = clean_text(c)
                 if valid_radar_name(name):
-                    radars.append({
-                        "RADAR_TYPE": rtype,
-                        "RADAR_NAME": name,
-                        "BAND_TYPE": band
-                    })
+                    canonical = RADAR_CATALOG.canonical(name) if RADAR_CATALOG else None
+                    radars.append(Radar(rtype, name, band, canonical))
 
     return radars
 
@@ -188,29 +220,101 @@ def extract_radars(raw_text):
 # MAIN NORMALIZATION
 # -------------------------
 
-with open(INPUT_FILE, "r", encoding="utf-8") as f:
-    raw_data = json.load(f)
-
-final_data = []
-
-for entry in raw_data:
+def normalize_entry(entry):
+    """Normalize one raw platform block to a Platform, or None if it is filtered out."""
     platform_class = clean_text(entry["PLATFORM_CLASS"])
 
     if platform_class.upper() in BAD_PLATFORM_CLASSES:
-        continue
-
-    final_data.append({
-        "COUNTRY_NAME": entry["COUNTRY_NAME"],
-        "CLASS_OF_SHIP": entry["CLASS_OF_SHIP"],
-        "PLATFORM_CLASS": platform_class,
-        "PLATFORM NAMES": extract_platform_names(entry["RAW_TEXT"]),
-        "RADARS": extract_radars(entry["RAW_TEXT"]),
-        "IMG_PATH": entry["IMG_PATH"][0] if entry["IMG_PATH"] else None
-    })
-
-with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-    json.dump(final_data, f, indent=2, ensure_ascii=False)
-
-print("Normalization complete.")
-print("Total records:", len(final_data))
-print(json.dumps(final_data[:2], indent=2, ensure_ascii=False))
+        return None
+
+    return Platform(
+        entry["COUNTRY_NAME"],
+        entry["CLASS_OF_SHIP"],
+        platform_class,
+        extract_platform_names(entry["RAW_TEXT"]),
+        extract_radars(entry["RAW_TEXT"]),
+        entry["IMG_PATH"][:1],
+    )
+
+
+def normalize_chunk(entries):
+    return [normalize_entry(entry) for entry in entries]
+
+
+def iter_chunks(records, size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def normalize_parallel(records, workers, chunk_size):
+    """
+    Normalize chunks of records in a process pool, yielding results in the
+    original order. At most 2 chunks per worker are outstanding, so memory
+    stays bounded no matter how large the input is.
+    """
+    with Pool(workers) as pool:
+        pending = deque()
+        for chunk in iter_chunks(records, chunk_size):
+            pending.append(pool.apply_async(normalize_chunk, (chunk,)))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def normalize_serial(records, metrics):
+    for entry in records:
+        with metrics.accumulate("normalize"):
+            record = normalize_entry(entry)
+        yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize raw Janes platform blocks")
+    parser.add_argument("--input", default=INPUT_FILE,
+                        help="raw records, .json array or .jsonl")
+    parser.add_argument("--output", default=OUTPUT_FILE,
+                        help="normalized records, .json array or .jsonl")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes normalizing chunks of records in parallel")
+    parser.add_argument("--chunk-size", type=int, default=200,
+                        help="records handed to a worker at a time")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    with instrument(args, "normalize_janes") as metrics:
+        records = iter_records(args.input)
+        if metrics.enabled:
+            records = metrics.timed("json_read", records)
+
+        if args.workers > 1:
+            results = normalize_parallel(records, args.workers, args.chunk_size)
+            if metrics.enabled:
+                results = metrics.timed("normalize_parallel", results)
+        elif metrics.enabled:
+            results = normalize_serial(records, metrics)
+        else:
+            results = map(normalize_entry, records)
+
+        # records stream through one at a time in either format
+        with metrics.stage("normalize", workers=args.workers), \
+                RecordWriter(args.output, keep_head=2) as out:
+            for record in results:
+                if record is not None:
+                    if metrics.enabled:
+                        with metrics.accumulate("json_write"):
+                            out.write(record.to_dict())
+                    else:
+                        out.write(record.to_dict())
+
+    print("Normalization complete.")
+    print("Total records:", out.count)
+    print(json.dumps(out.head, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+CACHE_DIR = "output/.ocr_cache"
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# -------------------------
+# CACHE
+# -------------------------
+class OCRCache:
+    """
+    Persistent OCR results keyed by page-image content plus engine settings.
+
+    Entries are one JSON file per key, written atomically, so a crashed run
+    keeps every page it finished and a re-run only OCRs new or changed pages.
+    """
+
+    def __init__(self, engine, lang, config=None, cache_dir=CACHE_DIR, enabled=True):
+        self.enabled = enabled
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+        settings = json.dumps(
+            {"engine": engine, "lang": lang, "config": config or {}},
+            sort_keys=True
+        )
+        self.salt = hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, image):
+        """Key for a page image given as a file path or an in-memory array."""
+        if isinstance(image, str):
+            digest = file_digest(image)
+        else:
+            h = hashlib.sha256(repr(image.shape).encode("ascii"))
+            h.update(image.tobytes())
+            digest = h.hexdigest()
+        return hashlib.sha256(
+            (self.salt + digest).encode("ascii")
+        ).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        if not self.enabled:
+            self.misses += 1
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def cached(self, image, run):
+        """Return the cached result for image, or run(image) and store it."""
+        key = self.key(image)
+        result = self.get(key)
+        if result is None:
+            result = run(image)
+            self.put(key, result)
+        return result
+
+    def report(self):
+        total = self.hits + self.misses
+        return f"OCR cache: {self.hits} hit(s), {self.misses} miss(es) of {total} page(s)"
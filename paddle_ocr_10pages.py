@@ -1,41 +1,347 @@
 import os
-import subprocess
+import json
+import shutil
+import argparse
+from functools import partial
+from collections import Counter
+import numpy as np
 from paddleocr import PaddleOCR
 
+from adaptive_ocr import AdaptiveOCR, EscalationReport, add_adaptive_args, line
+from layout_ocr import LayoutOCR, region_lines
+from page_triage import (
+    triage, pages_for, clear_skipped, summary, add_triage_args, OCR, STRUCTURE
+)
+from pdf_text import iter_split, page_lines, sources_summary, add_text_layer_args
+from ocr_cache import OCRCache, CACHE_DIR
+from pipeline_metrics import add_metrics_args, instrument
+from page_guard import PageWatchdog, PageFailures, add_guard_args, fallback_dpi
+from rasterize import (
+    iter_page_chunks, iter_image_batches, page_count, pdftoppm_name, render_region,
+    scratch_dir, CHUNK_SIZE, MAX_IN_FLIGHT
+)
+
 PDF = "janes10.pdf"
 IMG_DIR = "output/images"
 TXT_DIR = "output/text"
+DPI = 200
 
-os.makedirs(IMG_DIR, exist_ok=True)
-os.makedirs(TXT_DIR, exist_ok=True)
 
-# Convert PDF → images
-subprocess.run(
-    ["pdftoppm", "-r", "200", PDF, f"{IMG_DIR}/page", "-png"],
-    check=True
-)
+def ocr_image(ocr, img):
+    """img is a PNG path or a BGR uint8 array, as PaddleOCR expects."""
+    result = ocr.ocr(img, cls=True)
 
-# Initialize OCR
-ocr = PaddleOCR(
-    use_angle_cls=True,
-    lang="en",
-    use_gpu=False
-)
+    lines = []
+    if result and result[0]:
+        for r in result[0]:
+            lines.append(r[1][0])
+    return lines
 
-# OCR each page
-for img in sorted(os.listdir(IMG_DIR)):
-    if not img.endswith(".png"):
-        continue
 
-    img_path = os.path.join(IMG_DIR, img)
-    result = ocr.ocr(img_path, cls=True)
+def paddle_lines(ocr, img):
+    """ocr_image with confidences and boxes, as adaptive_ocr lines."""
+    result = ocr.ocr(img, cls=True)
 
     lines = []
     if result and result[0]:
-        for r in result[0]:
-            lines.append(r[1][0])
+        for box, (text, conf) in result[0]:
+            xs = [p[0] for p in box]
+            ys = [p[1] for p in box]
+            lines.append(line(
+                text, float(conf),
+                (int(min(xs)), int(min(ys)), int(max(xs)) + 1, int(max(ys)) + 1)
+            ))
+    return lines
+
+
+def paddle_line(ocr, path):
+    """Recognition only, for one cropped text line."""
+    result = ocr.ocr(path, det=False, cls=True)
+    if not result or not result[0]:
+        return "", 0.0
+    text, conf = result[0][0]
+    return text, float(conf)
+
+
+def run_adaptive(adaptive, page_num, img):
+    lines, escalation = adaptive.ocr(page_num, img)
+    return {"lines": [l["text"] for l in lines], "escalation": escalation}
+
+
+def make_runner(settings):
+    """
+    Engines for one run mode; returns run(page_num, page, plain=False) ->
+    the result that is cached per page, or with plain=True just the text
+    lines (used by the lower-DPI retry). Called in-process, or once per
+    PageWatchdog child so a stuck page can be killed.
+    """
+    ocr = PaddleOCR(
+        use_angle_cls=True,
+        lang="en",
+        use_gpu=False,
+        rec_batch_num=settings["rec_batch_num"]
+    )
+
+    if settings["mode"] == "adaptive":
+        adaptive = AdaptiveOCR(
+            settings["pdf"], partial(paddle_lines, ocr), partial(paddle_line, ocr),
+            work_dir=settings["work_dir"], **settings["adaptive"]
+        )
+        full = partial(run_adaptive, adaptive)
+    elif settings["mode"] == "layout":
+        from paddleocr import PPStructure
+
+        layout = LayoutOCR(
+            PPStructure(table=False, ocr=False, show_log=False, lang="en", use_gpu=False),
+            ocr,
+        )
+        full = lambda page_num, page: layout.run(page)
+    else:
+        full = lambda page_num, page: ocr_image(ocr, page)
+
+    def run(page_num, page, plain=False):
+        return ocr_image(ocr, page) if plain else full(page_num, page)
+    return run
+
+
+def clear_page(img, text_dir=TXT_DIR):
+    """
+    Empty the text file of a page triage skipped and drop its sidecars, so
+    merge_txt.py does not pick up what an earlier run read from it.
+    """
+    path = f"{text_dir}/{img}.txt"
+    open(path, "w", encoding="utf-8").close()
+    cleared = [path]
+    for sidecar in (f"{text_dir}/{img}.words.json", f"{text_dir}/{img}.layout.json"):
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+            cleared.append(sidecar)
+    return cleared
+
+
+def write_text_pages(text_pages, name_format, text_dir=TXT_DIR):
+    """Pages read from the PDF's text layer: the usual text file plus word boxes."""
+    for page_num, page in text_pages.items():
+        img = name_format.format(page_num)
+        with open(f"{text_dir}/{img}.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(page_lines(page)))
+        with open(f"{text_dir}/{img}.words.json", "w", encoding="utf-8") as f:
+            json.dump(page, f, ensure_ascii=False)
+
+
+def iter_hybrid_pages(args, total_pages, selected, render, sources):
+    """
+    Pages to OCR, one window of the PDF at a time: the window's usable
+    text-layer pages are written first, then render(pages) yields its other
+    pages. Only one window's word boxes are held; sources counts both kinds.
+    """
+    name_format = pdftoppm_name(total_pages)
+    windows = iter_split(args.pdf, last_page=total_pages, pages=selected,
+                         window=args.max_in_flight, log_file=args.sources_log)
+    for text_pages, ocr_pages in windows:
+        write_text_pages(text_pages, name_format, args.text_dir)
+        sources["text"] += len(text_pages)
+        sources["ocr"] += len(ocr_pages)
+        yield from render(ocr_pages)
+
+
+def to_bgr(image):
+    return np.ascontiguousarray(np.asarray(image.convert("RGB"))[:, :, ::-1])
+
+
+def iter_png_pages(args, total_pages, dpi, pages=None):
+    """PDF → PNG files, rendered in chunks while earlier pages are OCRed."""
+    chunks = iter_page_chunks(
+        args.pdf,
+        dpi,
+        out_dir=None if args.scratch else args.img_dir,
+        chunk_size=args.chunk_size,
+        max_in_flight=args.max_in_flight,
+        last_page=total_pages,
+        name_format=pdftoppm_name(total_pages),
+        pages=pages,
+    )
+    for chunk in chunks:
+        for page_num, img_path in chunk:
+            yield page_num, os.path.basename(img_path), img_path
+
+
+def iter_array_pages(args, total_pages, dpi, pages=None):
+    """
+    Rendered pages as BGR arrays, batch by batch,
+    skipping the PNG encode / decode round trip.
+    """
+    name_format = pdftoppm_name(total_pages)
+    if args.save_images:
+        os.makedirs(args.img_dir, exist_ok=True)
+
+    batches = iter_image_batches(args.pdf, dpi, args.batch_size, last_page=total_pages, pages=pages)
+    for batch in batches:
+        for page_num, image in batch:
+            img = name_format.format(page_num)
+            if args.save_images:
+                image.save(os.path.join(args.img_dir, img), "PNG")
+            yield page_num, img, to_bgr(image)
+            image.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PaddleOCR text extraction of the Janes PDF")
+    parser.add_argument("--pdf", default=PDF)
+    parser.add_argument("--img-dir", default=IMG_DIR, help="page PNGs")
+    parser.add_argument("--text-dir", default=TXT_DIR, help="one .txt per page")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="pages rendered per pdftoppm process")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT,
+                        help="cap on rendered pages waiting for OCR")
+    parser.add_argument("--scratch", action="store_true",
+                        help="render to a tmpfs scratch dir instead of keeping page PNGs")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="persistent OCR result cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="OCR every page even if a cached result exists")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="OCR rendered pages as arrays without the PNG round trip "
+                             "(with --page-timeout each array is copied to the OCR process)")
+    parser.add_argument("--batch-size", type=int, default=8,
+                        help="pages per in-memory render / recognition batch")
+    parser.add_argument("--save-images", action="store_true",
+                        help="with --in-memory, still write page PNGs to --img-dir")
+    parser.add_argument("--rec-batch-num", type=int, default=6,
+                        help="text lines per recognition batch")
+    parser.add_argument("--layout", action="store_true",
+                        help="run layout analysis first and recognize only text and table "
+                             "regions (coordinates in output/text/<page>.layout.json)")
+    add_adaptive_args(parser)
+    add_triage_args(parser)
+    add_text_layer_args(parser)
+    # the budget is opt-in here: it moves the engines into a child process
+    add_guard_args(parser, timeout=0,
+                   note=". The engines then run in a child process that is killed past "
+                        "the budget; with --in-memory every page array is pickled to it, "
+                        "so prefer PNG input when setting a budget")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+    if args.layout and args.adaptive:
+        parser.error("--layout and --adaptive cannot be combined")
+
+    os.makedirs(args.text_dir, exist_ok=True)
+    dpi = args.low_dpi if args.adaptive else DPI
+
+    total_pages = page_count(args.pdf)
+
+    selected = None
+    if args.triage:
+        decisions = triage(args.pdf, last_page=total_pages, log_file=args.triage_log)
+        selected = pages_for(decisions, {OCR, STRUCTURE})
+        # a usable text layer still overwrites a cleared page below
+        name_format = pdftoppm_name(total_pages)
+        clear_skipped(args.pdf, decisions, {OCR, STRUCTURE},
+                      lambda page_num: clear_page(name_format.format(page_num), args.text_dir),
+                      args.triage_log)
+        print(summary(decisions))
+
+    # Initialize OCR
+    work_dir = scratch_dir()
+    settings = {"mode": "text", "pdf": args.pdf, "rec_batch_num": args.rec_batch_num,
+                "work_dir": work_dir}
+
+    config = {"use_angle_cls": True, "cls": True, "dpi": dpi,
+              "input": "array" if args.in_memory else "png"}
+    if args.adaptive:
+        config["adaptive"] = {"high_dpi": args.high_dpi, "escalate": args.escalate,
+                              "min_confidence": args.min_confidence}
+        settings["mode"] = "adaptive"
+        settings["adaptive"] = {"low_dpi": args.low_dpi, "high_dpi": args.high_dpi,
+                                "min_confidence": args.min_confidence, "mode": args.escalate}
+        escalations = EscalationReport()
+    if args.layout:
+        config["layout"] = True
+        settings["mode"] = "layout"
+
+    # with a page budget the engines live in a child process that is
+    # killed and restarted when a page overruns
+    if args.page_timeout:
+        run = PageWatchdog(make_runner, settings, args.page_timeout)
+    else:
+        run = make_runner(settings)
+    retry_dpi = fallback_dpi(dpi, args.fallback_dpi)
+    failures = PageFailures()
+
+    def retry(page_num):
+        # plain OCR of a lower-DPI render; not cached, the full page may succeed next run
+        path = render_region(args.pdf, page_num, retry_dpi,
+                             os.path.join(work_dir, f"retry-{page_num}.png"))
+        try:
+            return run(page_num, path, True)
+        finally:
+            os.remove(path)
+
+    cache = OCRCache(
+        "paddleocr", "en",
+        config=config,
+        cache_dir=args.cache_dir,
+        enabled=not args.no_cache,
+    )
+
+    iter_pages = iter_array_pages if args.in_memory else iter_png_pages
+    render = partial(iter_pages, args, total_pages, dpi)
+    sources = Counter()
+    if args.text_layer:
+        # the text layer is read and classified window by window, just
+        # ahead of rasterizing the pages it cannot cover
+        pages = iter_hybrid_pages(args, total_pages, selected, render, sources)
+    else:
+        pages = render(selected)
+
+    # OCR each page
+    with instrument(args, "paddle_ocr_10pages") as metrics:
+        for page_num, img, page in metrics.timed("rasterize", pages):
+            with metrics.stage("ocr_page", page=page_num) as labels:
+                hits = cache.hits
+                result, attempt = failures.attempt(page_num, [
+                    ("full", lambda: cache.cached(page, lambda p: run(page_num, p))),
+                    (f"{retry_dpi}dpi", lambda: retry(page_num)),
+                ])
+                labels["cached"] = cache.hits > hits
+                labels["attempt"] = attempt
+                if result is None:
+                    print(f"Page {page_num} failed: {'; '.join(failures.failed[-1]['errors'])}")
+                    continue
+
+                if attempt != "full":
+                    lines = result
+                    result = {"regions": []}
+                elif args.adaptive:
+                    lines = result["lines"]
+                    escalations.add(result["escalation"])
+                    labels["escalated"] = result["escalation"]["escalated"]
+                elif args.layout:
+                    lines = region_lines(result["regions"])
+                    labels.update(result["stats"])
+                else:
+                    lines = result
+
+            with metrics.accumulate("text_write"):
+                with open(f"{args.text_dir}/{img}.txt", "w", encoding="utf-8") as f:
+                    f.write("\n".join(lines))
+                if args.layout:
+                    with open(f"{args.text_dir}/{img}.layout.json", "w", encoding="utf-8") as f:
+                        json.dump(result["regions"], f, indent=2, ensure_ascii=False)
+
+    if args.page_timeout:
+        run.close()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    failures.write(args.failure_report)
+
+    if args.adaptive:
+        print(escalations.report())
+    if args.text_layer:
+        print(sources_summary(sources["text"], sources["ocr"]))
+    print(cache.report())
+    print(failures.report(args.failure_report))
+    print("DONE")
 
-    with open(f"{TXT_DIR}/{img}.txt", "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
 
-print("DONE")
+if __name__ == "__main__":
+    main()
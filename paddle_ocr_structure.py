@@ -1,17 +1,27 @@
 import os
-import subprocess
+import shutil
+import argparse
 import json
 import numpy as np
-from paddleocr import PPStructure
+from paddleocr import PaddleOCR, PPStructure
+
+from adaptive_ocr import EscalationReport, add_adaptive_args, line, page_confidence
+from layout_ocr import LayoutOCR
+from page_triage import triage, pages_for, clear_skipped, summary, add_triage_args, STRUCTURE
+from ocr_cache import OCRCache, CACHE_DIR
+from pipeline_metrics import add_metrics_args, instrument
+from page_guard import PageWatchdog, PageFailures, add_guard_args, fallback_dpi
+from rasterize import (
+    iter_page_chunks, page_count, pdftoppm_name, render_region, scratch_dir,
+    CHUNK_SIZE, MAX_IN_FLIGHT
+)
 
 # ---------------- CONFIG ---------------- #
 
 PDF = "janes10.pdf"
 IMG_DIR = "output/images"
 STRUCT_DIR = "output/structure"
-
-os.makedirs(IMG_DIR, exist_ok=True)
-os.makedirs(STRUCT_DIR, exist_ok=True)
+DPI = 300
 
 # ---------------- HELPERS ---------------- #
 
@@ -29,40 +39,238 @@ def make_json_safe(obj):
     else:
         return obj
 
-# ---------------- PDF → IMAGES ---------------- #
 
-subprocess.run(
-    ["pdftoppm", "-r", "300", PDF, f"{IMG_DIR}/page", "-png"],
-    check=True
-)
+def structure_lines(result):
+    """Recognized text lines of a structure result (tables carry no confidence)."""
+    lines = []
+    for region in result:
+        res = region.get("res")
+        if isinstance(res, list):
+            for r in res:
+                if r.get("text"):
+                    lines.append(line(r["text"], float(r["confidence"]), region["bbox"]))
+    return lines
 
-# ---------------- STRUCTURE OCR ---------------- #
 
-engine = PPStructure(
-    show_log=True,
-    lang="en",
-    use_gpu=False  # FORCE CPU (cuDNN not available)
-)
+def structure_adaptive(engine, args, page_num, img_path, work_dir):
+    """
+    Structure OCR of a low-DPI page; re-run on a high-DPI render when the
+    page's text confidence is below --min-confidence. Layout and tables
+    come from a single pass, so whole pages are escalated, not regions.
+    """
+    result = make_json_safe(engine(img_path))
+    confidence = page_confidence(structure_lines(result))
+    escalation = {"page": page_num, "confidence": confidence, "escalated": None,
+                  "regions": 0, "improved": 0}
+
+    if confidence is not None and confidence < args.min_confidence:
+        hi_path = render_region(PDF, page_num, args.high_dpi,
+                                os.path.join(work_dir, f"page-{page_num}.png"))
+        try:
+            result = make_json_safe(engine(hi_path))
+        finally:
+            os.remove(hi_path)
+        escalation["escalated"] = "page"
+        escalation["confidence"] = page_confidence(structure_lines(result))
+
+    return {"result": result, "dpi": args.high_dpi if escalation["escalated"] else args.low_dpi,
+            "escalation": escalation}
+
+
+def clear_page(img):
+    """Remove the structure file an earlier run left for a page triage now skips."""
+    path = os.path.join(STRUCT_DIR, img.replace(".png", ".json"))
+    if not os.path.exists(path):
+        return []
+    os.remove(path)
+    return [path]
+
+
+def make_runner(settings):
+    """
+    Engines for one run mode; returns run(page_num, img_path, plain=False)
+    -> the result cached per page, or with plain=True the regions of one
+    pass without escalation (used by the lower-DPI retry). Called
+    in-process, or once per PageWatchdog child.
+    """
+    if settings["mode"] == "layout_first":
+        # layout once; text detection / recognition and table models only on crops
+        layout = LayoutOCR(
+            PPStructure(table=False, ocr=False, show_log=False, lang="en", use_gpu=False),
+            PaddleOCR(use_angle_cls=True, lang="en", use_gpu=False, show_log=False),
+            table=PPStructure(layout=False, show_log=False, lang="en", use_gpu=False),
+        )
+
+        def run(page_num, img_path, plain=False):
+            result = layout.run(img_path)
+            return result["regions"] if plain else result
+        return run
+
+    engine = PPStructure(
+        show_log=True,
+        lang="en",
+        use_gpu=False  # FORCE CPU (cuDNN not available)
+    )
+
+    def run(page_num, img_path, plain=False):
+        if settings["mode"] == "adaptive" and not plain:
+            return structure_adaptive(engine, settings["args"], page_num, img_path,
+                                      settings["work_dir"])
+        return make_json_safe(engine(img_path))
+    return run
+
 
-# ---------------- RUN PER PAGE ---------------- #
+def main():
+    parser = argparse.ArgumentParser(description="PPStructure layout OCR of the Janes PDF")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="pages rendered per pdftoppm process")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT,
+                        help="cap on rendered pages waiting for OCR")
+    parser.add_argument("--scratch", action="store_true",
+                        help="render to a tmpfs scratch dir instead of keeping page PNGs")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="persistent OCR result cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="OCR every page even if a cached result exists")
+    parser.add_argument("--layout-first", action="store_true",
+                        help="analyse layout once, then recognize only text and table "
+                             "regions instead of running the full engine on the page")
+    add_adaptive_args(parser, regions=False)
+    add_triage_args(parser, help="classify pages from thumbnails first and run structure "
+                                 "OCR only on table pages (text pages are left to the "
+                                 "text OCR scripts)")
+    # the budget is opt-in here: it moves the engines into a child process
+    add_guard_args(parser, timeout=0,
+                   note=". The engines then run in a child process that is killed past "
+                        "the budget")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+    if args.layout_first and args.adaptive:
+        parser.error("--layout-first and --adaptive cannot be combined")
 
-for img in sorted(os.listdir(IMG_DIR)):
-    if not img.endswith(".png"):
-        continue
+    os.makedirs(STRUCT_DIR, exist_ok=True)
+    dpi = args.low_dpi if args.adaptive else DPI
 
-    img_path = os.path.join(IMG_DIR, img)
-    print(f"Processing {img_path}")
+    total_pages = page_count(PDF)
 
-    result = engine(img_path)
+    selected = None
+    if args.triage:
+        decisions = triage(PDF, last_page=total_pages, log_file=args.triage_log)
+        selected = pages_for(decisions, {STRUCTURE})
+        name_format = pdftoppm_name(total_pages)
+        clear_skipped(PDF, decisions, {STRUCTURE},
+                      lambda page_num: clear_page(name_format.format(page_num)),
+                      args.triage_log)
+        print(summary(decisions))
 
-    safe_result = make_json_safe(result)
+    # ---------------- STRUCTURE OCR ---------------- #
 
-    out_path = os.path.join(
-        STRUCT_DIR, img.replace(".png", ".json")
+    config = {"dpi": dpi}
+    work_dir = scratch_dir()
+    settings = {"mode": "structure", "args": args, "work_dir": work_dir}
+    if args.layout_first:
+        config["layout_first"] = True
+        settings["mode"] = "layout_first"
+    if args.adaptive:
+        config["adaptive"] = {"high_dpi": args.high_dpi, "min_confidence": args.min_confidence}
+        settings["mode"] = "adaptive"
+        escalations = EscalationReport()
+
+    # with a page budget the engines live in a child process that is
+    # killed and restarted when a page overruns
+    if args.page_timeout:
+        run = PageWatchdog(make_runner, settings, args.page_timeout)
+    else:
+        run = make_runner(settings)
+    retry_dpi = fallback_dpi(dpi, args.fallback_dpi)
+    failures = PageFailures()
+
+    def retry(page_num):
+        # one pass over a lower-DPI render; not cached, the full page may succeed next run
+        path = render_region(PDF, page_num, retry_dpi,
+                             os.path.join(work_dir, f"retry-{page_num}.png"))
+        try:
+            return run(page_num, path, True)
+        finally:
+            os.remove(path)
+
+    cache = OCRCache(
+        "ppstructure", "en",
+        config=config,
+        cache_dir=args.cache_dir,
+        enabled=not args.no_cache,
     )
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(safe_result, f, indent=2)
+    # ---------------- PDF → IMAGES (CHUNKED) ---------------- #
+
+    chunks = iter_page_chunks(
+        PDF,
+        dpi,
+        out_dir=None if args.scratch else IMG_DIR,
+        chunk_size=args.chunk_size,
+        max_in_flight=args.max_in_flight,
+        last_page=total_pages,
+        name_format=pdftoppm_name(total_pages),
+        pages=selected,
+    )
+
+    # ---------------- RUN PER PAGE ---------------- #
+
+    with instrument(args, "paddle_ocr_structure") as metrics:
+        for chunk in metrics.timed("rasterize", chunks):
+            for page_num, img_path in chunk:
+                img = os.path.basename(img_path)
+                print(f"Processing {img_path}")
+
+                with metrics.stage("structure_page", page=page_num) as labels:
+                    hits = cache.hits
+                    result, attempt = failures.attempt(page_num, [
+                        ("full", lambda: cache.cached(img_path, lambda path: run(page_num, path))),
+                        (f"{retry_dpi}dpi", lambda: retry(page_num)),
+                    ])
+                    labels["cached"] = cache.hits > hits
+                    labels["attempt"] = attempt
+                    if result is None:
+                        print(f"Page {page_num} failed: "
+                              f"{'; '.join(failures.failed[-1]['errors'])}")
+                        continue
+
+                    if attempt != "full":
+                        # the same shape as every other page of the run; the
+                        # retry DPI is recorded in the failure report
+                        safe_result = result
+                        if args.adaptive:
+                            safe_result = {"dpi": retry_dpi, "regions": result}
+                    elif args.adaptive:
+                        # escalated pages have high-DPI coordinates
+                        safe_result = {"dpi": result["dpi"], "regions": result["result"]}
+                        escalations.add(result["escalation"])
+                        labels["escalated"] = result["escalation"]["escalated"]
+                    elif args.layout_first:
+                        safe_result = result["regions"]
+                        labels.update(result["stats"])
+                    else:
+                        safe_result = result
+
+                out_path = os.path.join(
+                    STRUCT_DIR, img.replace(".png", ".json")
+                )
+
+                with metrics.accumulate("json_write"):
+                    with open(out_path, "w", encoding="utf-8") as f:
+                        json.dump(safe_result, f, indent=2)
+
+    if args.page_timeout:
+        run.close()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    failures.write(args.failure_report)
+
+    if args.adaptive:
+        print(escalations.report())
+    print(cache.report())
+    print(failures.report(args.failure_report))
+    print("STRUCTURE OCR DONE")
 
-print("STRUCTURE OCR DONE")
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import multiprocessing
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+PAGE_TIMEOUT = 120       # seconds one OCR attempt may take (0 disables; opt-in for Paddle)
+FALLBACK_SCALE = 0.6     # the retry renders the page at this share of the DPI
+REPORT_FILE = "output/failed_pages.json"
+
+
+class PageTimeout(Exception):
+    """An OCR attempt ran past its time budget."""
+
+
+def describe(error):
+    if isinstance(error, PageTimeout):
+        return f"timeout ({error})"
+    return f"{type(error).__name__}: {error}"
+
+
+def fallback_dpi(dpi, requested=None):
+    return requested or max(72, int(dpi * FALLBACK_SCALE))
+
+
+class PageDeadline:
+    """
+    One page's time budget, shared by every OCR call made for it. start()
+    opens the page; until then each call may take the whole budget.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout or None
+        self.deadline = None
+
+    def start(self):
+        self.deadline = time.monotonic() + self.timeout if self.timeout else None
+
+    def remaining(self):
+        """Seconds left for the current page (None: unlimited); PageTimeout once spent."""
+        if self.timeout is None:
+            return None
+        if self.deadline is None:
+            return self.timeout
+        left = self.deadline - time.monotonic()
+        if left <= 0:
+            raise PageTimeout(f"{self.timeout:g}s")
+        return left
+
+
+# -------------------------
+# WATCHDOG
+# -------------------------
+def _serve(conn, factory, settings):
+    try:
+        run = factory(settings)
+    except Exception as e:
+        conn.send(("error", describe(e)))
+        return
+    conn.send(("ready", None))
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        try:
+            conn.send(("ok", run(*job)))
+        except Exception as e:
+            conn.send(("error", describe(e)))
+
+
+class PageWatchdog:
+    """
+    Runs OCR in a child process that can be killed when a page overruns.
+
+    factory(settings) is called once in the child and returns run(*args);
+    engines are built there, not in the caller. A call that takes longer
+    than `timeout` seconds kills the child and raises PageTimeout; the next
+    call starts a fresh child, so one stuck page costs one engine reload,
+    not the run.
+    """
+
+    def __init__(self, factory, settings, timeout=PAGE_TIMEOUT):
+        self.factory = factory
+        self.settings = settings
+        self.timeout = timeout or None
+        self.ctx = multiprocessing.get_context("spawn")
+        self.proc = None
+        self.conn = None
+        self.restarts = 0
+
+    def _start(self):
+        self.conn, child = self.ctx.Pipe()
+        self.proc = self.ctx.Process(
+            target=_serve, args=(child, self.factory, self.settings), daemon=True
+        )
+        self.proc.start()
+        child.close()
+
+        # engine start-up is not part of any page's budget
+        try:
+            status, value = self.conn.recv()
+        except EOFError:
+            status, value = "error", "OCR worker exited during start-up"
+        if status == "error":
+            self.proc.join()
+            self.proc = self.conn = None
+            raise RuntimeError(value)
+
+    def _kill(self):
+        self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+        self.proc = self.conn = None
+        self.restarts += 1
+
+    def __call__(self, *args):
+        if self.proc is None:
+            self._start()
+        self.conn.send(args)
+
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        while not self.conn.poll(1.0):
+            if not self.proc.is_alive():
+                self._kill()
+                raise RuntimeError("OCR worker died")
+            if deadline and time.monotonic() > deadline:
+                self._kill()
+                raise PageTimeout(f"{self.timeout:g}s")
+
+        status, value = self.conn.recv()
+        if status == "error":
+            raise RuntimeError(value)
+        return value
+
+    def close(self):
+        if self.proc is not None:
+            self.conn.send(None)
+            self.proc.join(5)
+            if self.proc.is_alive():
+                self.proc.kill()
+            self.proc = self.conn = None
+
+
+# -------------------------
+# RETRIES / REPORT
+# -------------------------
+class PageFailures:
+    """
+    Pages that no attempt could OCR, and pages a later attempt recovered
+    (with its label, e.g. the retry DPI), for the end-of-run report.
+    """
+
+    def __init__(self):
+        self.failed = []
+        self.recovered = []
+
+    def attempt(self, page_num, attempts):
+        """
+        Try each (label, fn) in turn; returns (result, label) from the first
+        that succeeds, or (None, None) after recording the page as failed.
+        """
+        errors = []
+        for label, fn in attempts:
+            try:
+                result = fn()
+            except Exception as e:
+                errors.append(f"{label}: {describe(e)}")
+                continue
+            if errors:
+                self.recover(page_num, label, errors)
+            return result, label
+        self.add(page_num, errors)
+        return None, None
+
+    def add(self, page_num, errors):
+        self.failed.append({"page": page_num, "errors": errors})
+
+    def recover(self, page_num, label, errors):
+        self.recovered.append({"page": page_num, "errors": errors, "recovered": label})
+
+    def write(self, path=REPORT_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(sorted(self.failed + self.recovered, key=lambda f: f["page"]), f, indent=2)
+
+    def report(self, path=REPORT_FILE):
+        if not self.failed:
+            return f"Page guard: no failed pages ({len(self.recovered)} recovered by a retry)"
+        pages = ", ".join(str(f["page"]) for f in sorted(self.failed, key=lambda f: f["page"]))
+        return (f"Page guard: {len(self.failed)} page(s) failed and were skipped: {pages} "
+                f"({len(self.recovered)} recovered by a retry); details in {path}")
+
+
+def add_guard_args(parser, timeout=PAGE_TIMEOUT, note=""):
+    parser.add_argument("--page-timeout", type=float, default=timeout,
+                        help="seconds one OCR attempt of a page may take before it is "
+                             "retried at a lower DPI (default: %(default)g; 0 disables)" + note)
+    parser.add_argument("--fallback-dpi", type=int,
+                        help=f"DPI of the retry (default: {FALLBACK_SCALE:g} x the OCR DPI)")
+    parser.add_argument("--failure-report", default=REPORT_FILE,
+                        help="JSON list of pages that failed an attempt: skipped ones, and "
+                             "those a retry recovered (its label in \"recovered\")")
@@ -0,0 +1,181 @@
+import queue
+import threading
+
+from rasterize import _Budget, MAX_IN_FLIGHT
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+QUEUE_SIZE = 16         # pages waiting between two stages
+POLL = 0.1              # seconds between stop checks on a blocked queue
+
+_DONE = object()
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def _put(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=POLL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q, stop):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=POLL)
+        except queue.Empty:
+            pass
+    return _DONE
+
+
+class _Stage:
+    """`workers` threads applying fn to each item of inbox; fn returns a list."""
+
+    def __init__(self, name, fn, workers, inbox, outbox, next_workers, stop, errors):
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.next_workers = next_workers
+        self.stop = stop
+        self.errors = errors
+        self.running = workers
+        self.lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self.work, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        for t in self.threads:
+            t.start()
+
+    def work(self):
+        try:
+            while True:
+                item = self.next_item()
+                if item is _DONE:
+                    break
+                for out in self.fn(item):
+                    if not _put(self.outbox, out, self.stop):
+                        return
+        except Exception as e:
+            self.errors.append(e)
+            self.stop.set()
+        finally:
+            with self.lock:
+                self.running -= 1
+                last = self.running == 0
+            # the last worker out tells every worker of the next stage
+            if last:
+                for _ in range(self.next_workers):
+                    _put(self.outbox, _DONE, self.stop)
+
+    def next_item(self):
+        return _get(self.inbox, self.stop)
+
+    def join(self):
+        for t in self.threads:
+            t.join()
+
+
+class _RenderStage(_Stage):
+    """Takes page runs in order, reserving their pages from the budget first."""
+
+    def __init__(self, runs, budget, *args):
+        super().__init__(*args)
+        self.runs = iter(runs)
+        self.budget = budget
+        self.order = threading.Lock()
+
+    def next_item(self):
+        # permits are taken in run order, so the page the writer waits for
+        # always has its share of the budget
+        with self.order:
+            run = next(self.runs, _DONE)
+            if run is not _DONE:
+                self.budget.take(run[1] - run[0] + 1, self.stop)
+        return _DONE if self.stop.is_set() else run
+
+
+# -------------------------
+# PUBLIC API
+# -------------------------
+def run_pipeline(
+    runs,
+    render,
+    ocr,
+    save=None,
+    render_workers=1,
+    ocr_workers=1,
+    save_workers=1,
+    max_in_flight=MAX_IN_FLIGHT,
+    queue_size=QUEUE_SIZE,
+):
+    """
+    Rasterize, OCR and save pages as concurrent stages joined by bounded
+    queues; yield the results in page order for the caller to write.
+
+    render(first, last) -> [(page_num, path), ...]   e.g. rasterize.render_chunk
+    ocr((page_num, path)) -> result, result[0] == page_num
+    save(result) -> result                           e.g. move the page image out of scratch
+
+    Each stage runs its own number of threads (ocr may hand each page to a
+    process pool). Besides the queue bounds, at most max_in_flight pages
+    are rendered but not yet written; a page counts as written once the
+    caller asks for the next result.
+    """
+    runs = list(runs)
+    largest = max((last - first + 1 for first, last in runs), default=0)
+    if max_in_flight < largest:
+        raise ValueError("max_in_flight must be at least the chunk size")
+
+    order = [p for first, last in runs for p in range(first, last + 1)]
+    stop = threading.Event()
+    errors = []
+    budget = _Budget(max_in_flight)
+
+    to_ocr = queue.Queue(queue_size)
+    to_save = queue.Queue(queue_size)
+    done = queue.Queue(queue_size)
+
+    stages = [
+        _RenderStage(runs, budget, "render", lambda run: render(*run), render_workers,
+                     None, to_ocr, ocr_workers, stop, errors),
+    ]
+    if save is None:
+        stages.append(_Stage("ocr", lambda page: [ocr(page)], ocr_workers,
+                             to_ocr, done, 1, stop, errors))
+    else:
+        stages.append(_Stage("ocr", lambda page: [ocr(page)], ocr_workers,
+                             to_ocr, to_save, save_workers, stop, errors))
+        stages.append(_Stage("save", lambda result: [save(result)], save_workers,
+                             to_save, done, 1, stop, errors))
+    for s in stages:
+        s.start()
+
+    try:
+        waiting = {}
+        for page_num in order:
+            while page_num not in waiting:
+                result = _get(done, stop)
+                if result is _DONE:
+                    if errors:
+                        raise errors[0]
+                    raise RuntimeError(f"pipeline stopped before page {page_num}")
+                waiting[result[0]] = result
+
+            yield waiting.pop(page_num)
+            budget.give(1)
+    finally:
+        stop.set()
+        budget.give(max_in_flight)
+        for s in stages:
+            s.join()
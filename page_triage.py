@@ -0,0 +1,199 @@
+import os
+import json
+import shutil
+import argparse
+
+from PIL import Image, ImageChops
+
+from rasterize import render_chunk, page_count, page_runs, scratch_dir, CHUNK_SIZE
+from pipeline_metrics import add_metrics_args, instrument
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+PDF_FILE = "janes10.pdf"
+LOG_FILE = "output/triage.jsonl"
+THUMB_DPI = 50
+
+DARK = 128               # grey level below which a pixel is ink
+MIDTONE = (48, 208)      # continuous-tone range that marks photographs
+GRID = (24, 32)          # cells for the photo-area estimate
+PHOTO_CELL = 0.5         # share of mid-tone pixels that makes a cell photographic
+TEXT_ROW = (0.02, 0.5)   # ink share of a pixel row that looks like a text line
+RULE_ROW = 0.4           # ink share of a thin row that looks like a table rule
+LINE_PITCH_PT = 11       # body text leading
+
+MIN_INK = 0.003          # below this the page is blank
+MIN_TEXT_LINES = 3       # fewer lines and the page has nothing worth reading
+PHOTO_PAGE = 0.6         # photo share of a plate / advert
+MIN_RULES = 3            # ruled rows that make a page table-bearing
+
+# decisions, cheapest first
+NONE = "none"            # photo plate, blank, advert: nothing to OCR
+OCR = "ocr"              # running text: plain text OCR
+STRUCTURE = "structure"  # tables: layout / structure OCR
+
+
+# -------------------------
+# FEATURES
+# -------------------------
+def page_features(image, dpi=THUMB_DPI):
+    """Ink density, photo-area share, text-line and rule counts of a thumbnail."""
+    gray = image.convert("L")
+    w, h = gray.size
+    total = w * h
+
+    hist = gray.histogram()
+    ink = sum(hist[:DARK]) / total
+
+    lo, hi = MIDTONE
+    midtone = gray.point(lambda v: 255 if lo <= v <= hi else 0)
+    cells = midtone.resize(GRID, Image.BOX).point(lambda v: 255 if v > 255 * PHOTO_CELL else 0)
+    photo_share = sum(1 for v in cells.getdata() if v) / (GRID[0] * GRID[1])
+
+    # mean ink per pixel row outside photographs: inky rows / line pitch
+    # estimates the number of text lines even where lines merge at thumbnail
+    # scale; short runs of very inky rows are table rules
+    dark = gray.point(lambda v: 255 if v < DARK else 0)
+    dark = ImageChops.subtract(dark, cells.resize((w, h), Image.NEAREST))
+    rows = [v / 255 for v in dark.resize((1, h), Image.BOX).getdata()]
+    text_rows = sum(1 for share in rows if TEXT_ROW[0] <= share <= TEXT_ROW[1])
+    text_lines = int(text_rows / (LINE_PITCH_PT / 72 * dpi))
+
+    rules = run = 0
+    for share in rows + [0.0]:
+        if share >= RULE_ROW:
+            run += 1
+            continue
+        if 0 < run <= 2:
+            rules += 1
+        run = 0
+
+    return {
+        "ink": round(ink, 4),
+        "photo_share": round(photo_share, 3),
+        "text_lines": text_lines,
+        "rules": rules,
+    }
+
+
+def classify(features):
+    """(decision, reason) for one page's features."""
+    if features["ink"] < MIN_INK:
+        return NONE, "blank"
+    if features["photo_share"] >= PHOTO_PAGE and features["text_lines"] < 2 * MIN_TEXT_LINES:
+        return NONE, "photo plate"
+    if features["text_lines"] < MIN_TEXT_LINES:
+        return NONE, "too little text"
+    if features["rules"] >= MIN_RULES:
+        return STRUCTURE, "ruled table"
+    return OCR, "text"
+
+
+# -------------------------
+# TRIAGE
+# -------------------------
+def triage(pdf, first_page=1, last_page=None, dpi=THUMB_DPI, chunk_size=CHUNK_SIZE,
+           log_file=LOG_FILE):
+    """
+    Classify every page from a low-resolution greyscale thumbnail.
+    Returns {page_num: decision}; each decision, its reason and the
+    features behind it are appended to log_file (JSON Lines) for audit.
+    """
+    if last_page is None:
+        last_page = page_count(pdf)
+
+    decisions = {}
+    work = scratch_dir()
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    log = open(log_file, "a", encoding="utf-8") if log_file else None
+
+    try:
+        for first, last in page_runs(first_page, last_page, chunk_size):
+            for page_num, path in render_chunk(pdf, dpi, first, last, work, gray=True):
+                with Image.open(path) as thumb:
+                    features = page_features(thumb, dpi)
+                os.remove(path)
+
+                decision, reason = classify(features)
+                decisions[page_num] = decision
+                if log:
+                    log.write(json.dumps({
+                        "pdf": pdf, "page": page_num, "decision": decision,
+                        "reason": reason, **features,
+                    }) + "\n")
+    finally:
+        if log:
+            log.close()
+        shutil.rmtree(work, ignore_errors=True)
+
+    return decisions
+
+
+def pages_for(decisions, wanted):
+    """Page numbers whose decision is in `wanted`, in order."""
+    return [p for p, d in sorted(decisions.items()) if d in wanted]
+
+
+def clear_skipped(pdf, decisions, wanted, clear, log_file=LOG_FILE):
+    """
+    For every page whose decision is not in `wanted`, clear(page_num) undoes
+    what an earlier run wrote for it and returns the paths it touched, so
+    stale output is not picked up downstream. Each cleared page is appended
+    to log_file.
+    """
+    log = open(log_file, "a", encoding="utf-8") if log_file else None
+    try:
+        for page_num, decision in sorted(decisions.items()):
+            if decision in wanted:
+                continue
+            cleared = clear(page_num)
+            if log and cleared:
+                log.write(json.dumps({
+                    "pdf": pdf, "page": page_num, "decision": decision, "cleared": cleared,
+                }) + "\n")
+    finally:
+        if log:
+            log.close()
+
+
+def summary(decisions):
+    counts = {}
+    for d in decisions.values():
+        counts[d] = counts.get(d, 0) + 1
+    parts = ", ".join(f"{counts.get(d, 0)} {d}" for d in (NONE, OCR, STRUCTURE))
+    return f"Triage: {len(decisions)} page(s): {parts}"
+
+
+def add_triage_args(parser, help="classify pages from thumbnails first and skip "
+                                  "those that need no OCR"):
+    parser.add_argument("--triage", action="store_true", help=help)
+    parser.add_argument("--triage-log", default=LOG_FILE,
+                        help="JSON Lines audit log of triage decisions")
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Classify PDF pages before OCR")
+    parser.add_argument("--pdf", default=PDF_FILE)
+    parser.add_argument("--first-page", type=int, default=1)
+    parser.add_argument("--last-page", type=int)
+    parser.add_argument("--dpi", type=int, default=THUMB_DPI)
+    parser.add_argument("--log", default=LOG_FILE)
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    with instrument(args, "page_triage") as metrics, metrics.stage("triage") as labels:
+        decisions = triage(args.pdf, args.first_page, args.last_page, args.dpi,
+                           log_file=args.log)
+        labels["pages"] = len(decisions)
+    print(summary(decisions))
+    print(f"Decisions logged to {args.log}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import os
+import re
+import json
+import html
+import argparse
+import subprocess
+import unicodedata
+
+from rasterize import page_count, page_runs, CHUNK_SIZE, MAX_IN_FLIGHT
+from pipeline_metrics import add_metrics_args, instrument
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+PDF_FILE = "janes10.pdf"
+LOG_FILE = "output/page_sources.jsonl"
+
+MIN_CHARS = 100          # fewer characters: scanned page or image-only text
+MAX_BAD_CHARS = 0.02     # share of unmapped / private-use glyphs
+MIN_WORD_SHARE = 0.6     # share of tokens that look like words or numbers
+
+TAG_RE = re.compile(
+    r"<page ([^>]*)>|<block ([^>]*)>|<line ([^>]*)>|<word ([^>]*)>(.*?)</word>", re.S
+)
+ATTR_RE = re.compile(r'(\w+)="([^"]*)"')
+WORD_RE = re.compile(r"[A-Za-z][a-z'’\-]+|[A-Z0-9][A-Z0-9'’\-/]*|\d+(?:[.,]\d+)*")
+PUNCT = ".,;:()[]'\"“”‘’!?"
+
+
+# -------------------------
+# TEXT LAYER
+# -------------------------
+def _bbox(attrs):
+    a = dict(ATTR_RE.findall(attrs))
+    return [float(a["xMin"]), float(a["yMin"]), float(a["xMax"]), float(a["yMax"])]
+
+
+def parse_bbox_layout(xhtml, first_page):
+    """
+    Pages from `pdftotext -bbox-layout` output:
+    [{"page", "width", "height", "blocks": [{"bbox", "lines": [{"bbox", "text",
+    "words": [{"text", "bbox"}]}]}]}], coordinates in PDF points.
+    """
+    pages = []
+    for m in TAG_RE.finditer(xhtml):
+        page, block, line, word, text = m.groups()
+        if page is not None:
+            a = dict(ATTR_RE.findall(page))
+            pages.append({
+                "page": first_page + len(pages),
+                "width": float(a["width"]),
+                "height": float(a["height"]),
+                "blocks": [],
+            })
+        elif block is not None:
+            pages[-1]["blocks"].append({"bbox": _bbox(block), "lines": []})
+        elif line is not None:
+            pages[-1]["blocks"][-1]["lines"].append({"bbox": _bbox(line), "text": "", "words": []})
+        else:
+            ln = pages[-1]["blocks"][-1]["lines"][-1]
+            ln["words"].append({"text": html.unescape(text), "bbox": _bbox(word)})
+            ln["text"] = " ".join(w["text"] for w in ln["words"])
+    return pages
+
+
+def page_lines(page):
+    return [ln["text"] for block in page["blocks"] for ln in block["lines"]]
+
+
+def iter_text_pages(pdf, first_page=1, last_page=None, chunk_size=CHUNK_SIZE):
+    """Text layer with word boxes, one pdftotext process per chunk of pages."""
+    if last_page is None:
+        last_page = page_count(pdf)
+
+    for first, last in page_runs(first_page, last_page, chunk_size):
+        out = subprocess.run(
+            ["pdftotext", "-f", str(first), "-l", str(last), "-bbox-layout", pdf, "-"],
+            check=True, capture_output=True
+        ).stdout.decode("utf-8", errors="replace")
+        yield from parse_bbox_layout(out, first)
+
+
+# -------------------------
+# QUALITY
+# -------------------------
+def text_quality(text):
+    """(usable, reason, stats) for a page's extracted text."""
+    chars = len("".join(text.split()))
+    stats = {"chars": chars}
+    if chars < MIN_CHARS:
+        return False, "no text layer", stats
+
+    bad = sum(
+        1 for c in text
+        if c == "�" or (unicodedata.category(c) in ("Co", "Cn", "Cc") and not c.isspace())
+    )
+    stats["bad_share"] = round(bad / chars, 4)
+    if bad / chars > MAX_BAD_CHARS:
+        return False, "garbled (unmapped glyphs)", stats
+
+    tokens = [t.strip(PUNCT) for t in text.split()]
+    tokens = [t for t in tokens if t]
+    wordlike = sum(1 for t in tokens if WORD_RE.fullmatch(t))
+    stats["word_share"] = round(wordlike / len(tokens), 3) if tokens else 0.0
+    if stats["word_share"] < MIN_WORD_SHARE:
+        return False, "garbled (non-words)", stats
+
+    return True, "text layer", stats
+
+
+# -------------------------
+# HYBRID SPLIT
+# -------------------------
+def iter_split(pdf, first_page=1, last_page=None, pages=None, window=MAX_IN_FLIGHT,
+               log_file=LOG_FILE):
+    """
+    Decide per page whether the PDF's own text can be used, `window` pages
+    at a time, so only one window's text layer (with its word boxes) is
+    held while its other pages are OCRed. Yields, per window in page order,
+    ({page_num: text-layer page} for usable pages, [page numbers that still
+    need OCR]); each page's path and the reason are appended to log_file
+    (JSON Lines). With pages (e.g. after triage), no other page is sent to
+    OCR.
+    """
+    selected = None if pages is None else set(pages)
+    if last_page is None:
+        last_page = page_count(pdf)
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    log = open(log_file, "a", encoding="utf-8") if log_file else None
+
+    try:
+        for first, last in page_runs(first_page, last_page, window):
+            text_pages, ocr_pages = {}, []
+            for page in iter_text_pages(pdf, first, last):
+                usable, reason, stats = text_quality("\n".join(page_lines(page)))
+                if usable:
+                    text_pages[page["page"]] = page
+                elif selected is None or page["page"] in selected:
+                    ocr_pages.append(page["page"])
+                if log:
+                    log.write(json.dumps({
+                        "pdf": pdf, "page": page["page"],
+                        "source": "text_layer" if usable else "ocr",
+                        "reason": reason, **stats,
+                    }) + "\n")
+            yield text_pages, ocr_pages
+    finally:
+        if log:
+            log.close()
+
+
+def sources_summary(n_text, n_ocr):
+    return (f"Text layer: {n_text} page(s) read directly, "
+            f"{n_ocr} page(s) sent to OCR")
+
+
+def add_text_layer_args(parser):
+    parser.add_argument("--text-layer", action="store_true",
+                        help="use the PDF's embedded text where it is usable and OCR "
+                             "only the remaining pages")
+    parser.add_argument("--sources-log", default=LOG_FILE,
+                        help="JSON Lines log of the path each page took")
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Check which PDF pages have a usable text layer")
+    parser.add_argument("--pdf", default=PDF_FILE)
+    parser.add_argument("--first-page", type=int, default=1)
+    parser.add_argument("--last-page", type=int)
+    parser.add_argument("--log", default=LOG_FILE)
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    n_text = n_ocr = 0
+    with instrument(args, "pdf_text") as metrics:
+        windows = iter_split(args.pdf, args.first_page, args.last_page, log_file=args.log)
+        for text_pages, ocr_pages in metrics.timed("read_text_layer", windows):
+            n_text += len(text_pages)
+            n_ocr += len(ocr_pages)
+    print(sources_summary(n_text, n_ocr))
+    print(f"Per-page sources logged to {args.log}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def peak_rss_mb():
+    """High-water RSS of this process so far (0 where unavailable)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def children_cpu():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+# -------------------------
+# METRICS
+# -------------------------
+class Metrics:
+    """
+    Wall time, CPU time and peak memory per pipeline stage.
+
+    stage()       one timed block, e.g. a whole pass or a single page
+    add()         a measurement taken elsewhere (pool worker results)
+    accumulate()  many short calls folded into one total, e.g. per element
+    timed()       total time spent waiting on an iterator (parsing, rendering)
+    """
+
+    def __init__(self, name=None, enabled=True):
+        self.name = name
+        # callers skip per-element accumulate()/timed() hooks when disabled
+        self.enabled = enabled
+        self.events = []
+        self.totals = {}
+        self.wall0 = time.perf_counter()
+        self.cpu0 = time.process_time()
+        self.children0 = children_cpu()
+
+    @contextmanager
+    def stage(self, name, **labels):
+        """Time the block; it may add labels to the yielded dict as it runs."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        children = children_cpu()
+        try:
+            yield labels
+        finally:
+            self.add(
+                name,
+                time.perf_counter() - wall,
+                time.process_time() - cpu + children_cpu() - children,
+                **labels
+            )
+
+    def add(self, name, wall_s, cpu_s=None, **labels):
+        event = {"stage": name, "wall_s": round(wall_s, 6)}
+        if cpu_s is not None:
+            event["cpu_s"] = round(cpu_s, 6)
+        event["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        event.update(labels)
+        self.events.append(event)
+
+    def _total(self, name, wall_s, cpu_s):
+        total = self.totals.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+        total["wall_s"] += wall_s
+        total["cpu_s"] += cpu_s
+        total["calls"] += 1
+
+    @contextmanager
+    def accumulate(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self._total(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def timed(self, name, iterable):
+        it = iter(iterable)
+        while True:
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            try:
+                item = next(it)
+            except StopIteration:
+                self._total(name, time.perf_counter() - wall, time.process_time() - cpu)
+                return
+            self._total(name, time.perf_counter() - wall, time.process_time() - cpu)
+            yield item
+
+    def summary(self):
+        return {
+            "entry_point": self.name,
+            "argv": sys.argv[1:],
+            "pid": os.getpid(),
+            "wall_s": round(time.perf_counter() - self.wall0, 6),
+            "cpu_s": round(time.process_time() - self.cpu0, 6),
+            "children_cpu_s": round(children_cpu() - self.children0, 6),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "totals": {
+                name: {k: round(v, 6) if isinstance(v, float) else v for k, v in t.items()}
+                for name, t in self.totals.items()
+            },
+            "stages": self.events,
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+# -------------------------
+# ENTRY POINT WIRING
+# -------------------------
+def add_metrics_args(parser):
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write per-stage timing / memory metrics as JSON")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="capture a cProfile of the run (.prof, for snakeviz / flameprof)")
+
+
+@contextmanager
+def instrument(args, name):
+    """Yield a Metrics for the run; write it and the optional profile on exit."""
+    metrics = Metrics(name, enabled=bool(getattr(args, "metrics", None)))
+    profiler = cProfile.Profile() if getattr(args, "profile", None) else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile}")
+        if getattr(args, "metrics", None):
+            metrics.write(args.metrics)
+            print(f"Metrics written to {args.metrics}")
@@ -0,0 +1,199 @@
+import os
+import re
+import json
+import argparse
+from collections import Counter
+
+from janes_io import iter_records
+from pipeline_metrics import add_metrics_args, instrument
+
+# -------------------------
+# CONFIG
+# -------------------------
+CATALOG_FILE = "radar_catalog.json"
+INPUT_FILE = "final_output.json"
+
+MIN_SIMILARITY = 0.6     # Dice coefficient over trigrams to accept a match
+MAX_POSTINGS = 2000      # trigrams shared by more entries than this are skipped
+
+COUNT_RE = re.compile(r"^\d+\s*[x×]?\s+")           # "1 JRC JMA5310-6"
+MARK_RE = re.compile(r"\s+[©@O]$")                  # picture credit marks
+PAREN_RE = re.compile(r"\(.*?\)")
+RADAR_RE = re.compile(r"\b(?:SEARCH\s+)?RADARS?\b")
+NON_ALNUM_RE = re.compile(r"[^A-Z0-9]+")
+NUMBER_RE = re.compile(r"\d+")
+
+
+# -------------------------
+# KEYS
+# -------------------------
+def radar_words(name):
+    """Upper-case words of a radar name without counts, marks or NATO names."""
+    name = MARK_RE.sub("", name.strip())
+    name = COUNT_RE.sub("", name).upper()
+    name = PAREN_RE.sub(" ", name)
+    name = RADAR_RE.sub(" ", name)
+    return NON_ALNUM_RE.sub(" ", name).split()
+
+
+def radar_key(name):
+    # spacing and hyphenation vary ("JMA5310-6", "JMA 5310-6"): compare letters and digits only
+    return "".join(radar_words(name))
+
+
+def model_numbers(words):
+    return frozenset(NUMBER_RE.findall(" ".join(words)))
+
+
+def trigrams(key):
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# -------------------------
+# CATALOG
+# -------------------------
+class RadarCatalog:
+    """
+    Canonical radar names with a trigram index.
+
+    Catalog file: [{"name": "JRC JMA 5310", "vendor": "JRC",
+                    "aliases": ["JMA5310"]}, ...]
+    An entry without a model (name == vendor) catches names that give only
+    the vendor, or a model the catalog does not list yet.
+
+    lookup() tries the exact key, then scores only the entries sharing a
+    trigram with the query, then falls back to a vendor entry. Results are
+    memoized per raw string, since the same spellings recur throughout
+    the book.
+    """
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self.exact = {}
+        self.sizes = []          # trigram count per indexed key
+        self.numbers = []        # model numbers per indexed key
+        self.owners = []         # entry index per indexed key
+        self.index = {}          # trigram -> [indexed key, ...]
+        self.vendors = {}        # vendor key -> entry index
+        self.memo = {}
+
+        for i, entry in enumerate(self.entries):
+            vendor = entry.get("vendor")
+            if vendor and radar_key(vendor) == radar_key(entry["name"]):
+                self.vendors[radar_key(vendor)] = i
+            for name in [entry["name"]] + entry.get("aliases", []):
+                words = radar_words(name)
+                key = "".join(words)
+                if not key or key in self.exact:
+                    continue
+                self.exact[key] = i
+                grams = trigrams(key)
+                k = len(self.sizes)
+                self.sizes.append(len(grams))
+                self.numbers.append(model_numbers(words))
+                self.owners.append(i)
+                for g in grams:
+                    self.index.setdefault(g, []).append(k)
+
+    @classmethod
+    def load(cls, path=CATALOG_FILE):
+        """A missing file means an empty catalog (nothing is canonicalized)."""
+        if not path or not os.path.exists(path):
+            return cls([])
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _fuzzy(self, key, numbers):
+        grams = trigrams(key)
+        shared = Counter()
+        for g in grams:
+            postings = self.index.get(g, ())
+            if len(postings) <= MAX_POSTINGS:
+                shared.update(postings)
+
+        best, best_score = None, MIN_SIMILARITY
+        for k, n in shared.items():
+            # "Type 363" is not "Type 360" however alike they look
+            if not self.numbers[k] <= numbers:
+                continue
+            score = 2 * n / (len(grams) + self.sizes[k])
+            if score > best_score:
+                best, best_score = self.owners[k], score
+        return best
+
+    def _vendor(self, words):
+        # longest leading run of words that names a vendor ("KELVIN HUGHES ...")
+        for n in range(len(words), 0, -1):
+            i = self.vendors.get("".join(words[:n]))
+            if i is not None:
+                return i
+        return None
+
+    def lookup(self, name):
+        """The catalog entry for a raw radar name, or None."""
+        if not name:
+            return None
+        if name in self.memo:
+            return self.memo[name]
+
+        words = radar_words(name)
+        key = "".join(words)
+        i = self.exact.get(key)
+        if i is None and key:
+            i = self._fuzzy(key, model_numbers(words))
+        if i is None:
+            i = self._vendor(words)
+
+        entry = self.entries[i] if i is not None else None
+        self.memo[name] = entry
+        return entry
+
+    def canonical(self, name):
+        entry = self.lookup(name)
+        return entry["name"] if entry else None
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report how the radar names of an output file map onto the catalog"
+    )
+    parser.add_argument("--input", default=INPUT_FILE, help=".json or .jsonl records")
+    parser.add_argument("--catalog", default=CATALOG_FILE)
+    parser.add_argument("--top", type=int, default=20,
+                        help="most frequent unmatched names to list")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+
+    with instrument(args, "radar_catalog") as metrics:
+        with metrics.stage("load_catalog") as labels:
+            catalog = RadarCatalog.load(args.catalog)
+            labels["entries"] = len(catalog)
+        matched, unmatched = Counter(), Counter()
+        with metrics.stage("match") as labels:
+            for record in iter_records(args.input):
+                for radar in record.get("RADARS") or []:
+                    name = radar.get("RADAR_NAME")
+                    canonical = catalog.canonical(name)
+                    if canonical:
+                        matched[canonical] += 1
+                    else:
+                        unmatched[name] += 1
+            labels["mentions"] = sum(matched.values()) + sum(unmatched.values())
+
+    total = sum(matched.values()) + sum(unmatched.values())
+    print(f"Catalog: {len(catalog)} entries; {sum(matched.values())}/{total} radar mentions "
+          f"matched ({len(catalog.memo)} distinct names)")
+    print("\nMost frequent unmatched:")
+    for name, n in unmatched.most_common(args.top):
+        print(f"  {n:5}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import os
+import glob
+import queue
+import shutil
+import tempfile
+import threading
+import subprocess
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+CHUNK_SIZE = 16         # pages per pdftoppm process
+MAX_IN_FLIGHT = 48      # rendered pages not yet released by the consumer
+PAGE_NAME = "page_{:04}.png"
+TMPFS_DIR = "/dev/shm"
+
+
+# -------------------------
+# HELPERS
+# -------------------------
+def page_count(pdf):
+    out = subprocess.run(
+        ["pdfinfo", pdf], check=True, capture_output=True, text=True
+    ).stdout
+    for line in out.splitlines():
+        if line.startswith("Pages:"):
+            return int(line.split(":", 1)[1])
+    raise ValueError(f"Could not read page count of {pdf}")
+
+
+def pdftoppm_name(total_pages):
+    """Name format matching plain `pdftoppm ... page -png` output."""
+    return "page-{:0%dd}.png" % len(str(total_pages))
+
+
+def page_runs(first_page, last_page, size, pages=None):
+    """
+    (first, last) ranges of at most `size` pages covering first_page..last_page,
+    or only the given page numbers, split wherever they are not consecutive.
+    """
+    if pages is None:
+        pages = range(first_page, last_page + 1)
+    runs = []
+    for page in sorted(pages):
+        if runs and page == runs[-1][1] + 1 and page - runs[-1][0] < size:
+            runs[-1][1] = page
+        else:
+            runs.append([page, page])
+    return [tuple(r) for r in runs]
+
+
+def scratch_dir():
+    """Temporary render directory, on tmpfs when the host has one."""
+    base = TMPFS_DIR if os.path.isdir(TMPFS_DIR) else None
+    return tempfile.mkdtemp(prefix="janes-raster-", dir=base)
+
+
+def render_chunk(pdf, dpi, first, last, out_dir, name_format=PAGE_NAME, gray=False):
+    """
+    Render pages first..last with a single pdftoppm process.
+    Returns [(page_num, path), ...] in page order.
+    """
+    prefix = os.path.join(out_dir, f".chunk-{first}")
+    subprocess.run(
+        ["pdftoppm", "-r", str(dpi), "-f", str(first), "-l", str(last)]
+        + (["-gray"] if gray else []) + ["-png", pdf, prefix],
+        check=True
+    )
+
+    pages = []
+    for tmp in glob.glob(glob.escape(prefix) + "-*.png"):
+        page_num = int(tmp[len(prefix) + 1:-len(".png")])
+        path = os.path.join(out_dir, name_format.format(page_num))
+        os.replace(tmp, path)
+        pages.append((page_num, path))
+
+    return sorted(pages)
+
+
+def render_region(pdf, page_num, dpi, out_path, box=None):
+    """
+    Render one page, or just box=(x0, y0, x1, y1) of it in pixels at `dpi`,
+    to the PNG out_path. pdftoppm crops before rasterizing, so a small
+    region costs a fraction of the whole page.
+    """
+    cmd = ["pdftoppm", "-r", str(dpi), "-f", str(page_num), "-l", str(page_num),
+           "-singlefile"]
+    if box is not None:
+        x0, y0, x1, y1 = box
+        cmd += ["-x", str(x0), "-y", str(y0), "-W", str(x1 - x0), "-H", str(y1 - y0)]
+    subprocess.run(cmd + ["-png", pdf, out_path[:-len(".png")]], check=True)
+    return out_path
+
+
+class _Budget:
+    """Counting semaphore that can take several permits at once."""
+
+    def __init__(self, size):
+        self.cond = threading.Condition()
+        self.free = size
+
+    def take(self, n, stop):
+        with self.cond:
+            while self.free < n and not stop.is_set():
+                self.cond.wait(0.1)
+            self.free -= n
+
+    def give(self, n):
+        with self.cond:
+            self.free += n
+            self.cond.notify_all()
+
+
+# -------------------------
+# PUBLIC API
+# -------------------------
+def iter_page_chunks(
+    pdf,
+    dpi,
+    out_dir=None,
+    chunk_size=CHUNK_SIZE,
+    max_in_flight=MAX_IN_FLIGHT,
+    first_page=1,
+    last_page=None,
+    name_format=PAGE_NAME,
+    pages=None,
+):
+    """
+    Yield [(page_num, path), ...] chunks in page order.
+    With pages, only those page numbers are rendered (e.g. after triage).
+
+    A background thread renders ahead with one pdftoppm process per chunk,
+    but never holds more than max_in_flight rendered pages that the caller
+    has not finished with. A chunk counts as finished once the caller asks
+    for the next one.
+
+    With out_dir=None pages go to a scratch directory (tmpfs if available)
+    and are deleted as soon as they are released; otherwise they are kept.
+    """
+    if max_in_flight < chunk_size:
+        raise ValueError("max_in_flight must be at least chunk_size")
+
+    if last_page is None and pages is None:
+        last_page = page_count(pdf)
+    runs = page_runs(first_page, last_page, chunk_size, pages)
+
+    keep = out_dir is not None
+    if keep:
+        os.makedirs(out_dir, exist_ok=True)
+    else:
+        out_dir = scratch_dir()
+
+    budget = _Budget(max_in_flight)
+    stop = threading.Event()
+    ready = queue.Queue()
+
+    def produce():
+        try:
+            for first, last in runs:
+                budget.take(last - first + 1, stop)
+                if stop.is_set():
+                    return
+                ready.put(render_chunk(pdf, dpi, first, last, out_dir, name_format))
+        except Exception as e:
+            ready.put(e)
+        ready.put(None)
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            chunk = ready.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+
+            yield chunk
+
+            if not keep:
+                for _, path in chunk:
+                    os.remove(path)
+            budget.give(len(chunk))
+    finally:
+        stop.set()
+        budget.give(max_in_flight)
+        worker.join()
+        if not keep:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def iter_image_batches(pdf, dpi, batch_size=CHUNK_SIZE, first_page=1, last_page=None,
+                       pages=None):
+    """
+    Yield [(page_num, PIL.Image), ...] batches rendered straight into memory.
+    pdf2image streams PPM from a single pdftoppm process per batch, so no
+    PNG is encoded or written to disk.
+    """
+    from pdf2image import convert_from_path
+
+    if last_page is None and pages is None:
+        last_page = page_count(pdf)
+
+    for first, last in page_runs(first_page, last_page, batch_size, pages):
+        images = convert_from_path(
+            pdf, dpi=dpi, first_page=first, last_page=last, fmt="ppm"
+        )
+        yield list(zip(range(first, last + 1), images))
+
+
+def iter_pages(pdf, dpi, **kwargs):
+    """Flat (page_num, path) stream over iter_page_chunks."""
+    for chunk in iter_page_chunks(pdf, dpi, **kwargs):
+        yield from chunk
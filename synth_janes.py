@@ -0,0 +1,209 @@
+import random
+import argparse
+import zlib
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+HTML_FILE = "synthetic_janes.htm"
+PDF_FILE = "synthetic_janes.pdf"
+
+COUNTRY_WORDS = [
+    "ALBA", "BRAVA", "CORSA", "DANOVA", "ESTRA", "FARON", "GALIA", "HESPER",
+    "IBERA", "JUTLA", "KARST", "LUSIA", "MORAVA", "NESTA", "ORLAN", "PONTA",
+]
+SHIP_TYPES = [
+    "PATROL FORCES", "FRIGATES", "CORVETTES", "MINE WARFARE FORCES",
+    "AMPHIBIOUS FORCES", "AUXILIARIES", "SURVEY AND RESEARCH SHIPS",
+]
+CLASS_WORDS = [
+    "DAMEN STAN PATROL", "MEKO", "PB MK III", "ARCHANGEL", "SHALDAG",
+    "DEFENDER", "VOSPER", "KEDAH", "GOWIND", "RIVER", "SA'AR", "OSPREY",
+]
+ROLES = ["PB", "PBF", "PBR", "FFGHM", "FS", "MHC", "AGS"]
+NAME_SYLLABLES = ["IL", "IR", "IA", "OR", "IK", "U", "LI", "SUS", "BU", "TRIN",
+                  "TI", "SHI", "RO", "KA", "MAR", "DA", "VEL", "NO", "STA"]
+RADARS = [
+    ("Surface search/navigation", "{n} JRC JMA5310-6", "I-band"),
+    ("Surface search", "Raymarine", "I-band"),
+    ("Air search", "Thales SMART-S Mk 2", "E/F-band"),
+    ("Fire control", "{n} Saab Ceros 200", "G-band"),
+    ("Navigation", "Furuno FAR-2127", "I-band"),
+    ("Air/surface search", "Hensoldt TRS-4D", "G-band"),
+]
+FILLER = (
+    "Built by a national yard to a modified commercial design and delivered "
+    "in a series of batches. Operated in the coastal patrol role from the "
+    "main naval base; a further unit is reported to be in reserve."
+)
+
+
+# -------------------------
+# HTML
+# -------------------------
+def ship_name(rng):
+    return "".join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def class_block(rng, country_idx, class_idx):
+    """One font5 platform class with its name table, radars and photo."""
+    n_ships = rng.randint(1, 6)
+    cls = f"{n_ships} {rng.choice(CLASS_WORDS)} {rng.randint(100, 9999)} CLASS"
+    role = rng.choice(ROLES)
+
+    out = [
+        f'<p><span class="font5">{cls}</span> <span class="font5">({role})</span></p>\n'
+    ]
+
+    if rng.random() < 0.8:
+        out.append('<table border="1">\n<tr><td><p>Name</p></td><td><p>No</p></td>'
+                   '<td><p>Builders</p></td><td><p>Commissioned</p></td></tr>\n')
+        for _ in range(n_ships):
+            out.append(
+                f"<tr><td><p>{ship_name(rng)}</p></td><td><p>P {rng.randint(1, 999)}</p></td>"
+                f"<td><p>Damen, Gorinchem</p></td><td><p>{rng.randint(1970, 2023)}</p></td></tr>\n"
+            )
+        out.append("</table>\n")
+    else:
+        names = "   ".join(ship_name(rng) for _ in range(n_ships))
+        out.append(f"<p>{names}</p>\n")
+
+    out.append(f"<p>Displacement, tonnes: {rng.randint(20, 4000)} full load</p>\n")
+    out.append(f"<p>Dimensions, metres: {rng.randint(10, 140)} x {rng.randint(3, 18)} x 2.1</p>\n")
+
+    radars = rng.sample(RADARS, rng.randint(1, 3))
+    parts = [
+        f"{rtype}: {name.format(n=rng.randint(1, 2))}; {band}"
+        for rtype, name, band in radars
+    ]
+    out.append(f"<p>Radars: {'. '.join(parts)}.</p>\n")
+    out.append(f"<p>Comment: {FILLER}</p>\n")
+    out.append(
+        f'<p><img src="synthetic_files/img-{country_idx:04}-{class_idx:03}.jpg" '
+        f'width="400" height="220" alt=""></p>\n'
+    )
+    return "".join(out)
+
+
+def write_html(path, countries, classes_per_country, seed=0):
+    """Write a Janes-style book; returns the number of font5 class blocks."""
+    rng = random.Random(seed)
+    blocks = 0
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<html><head><meta charset="utf-8"><style>'
+                '.font5{font-weight:bold}.font6{font-size:14pt}.font8{font-size:20pt}'
+                '</style></head><body>\n')
+
+        for c in range(countries):
+            country = f"{rng.choice(COUNTRY_WORDS).title()} {c}"
+            f.write(f'<p><span class="font8">{country}</span></p>\n')
+            f.write(f"<p>Headquarters Appointments: Commander of the Navy, {FILLER}</p>\n")
+
+            for k in range(classes_per_country):
+                if k == 0 or rng.random() < 0.3:
+                    f.write(f'<p><span class="font6">{rng.choice(SHIP_TYPES)}</span></p>\n')
+                f.write(class_block(rng, c, k))
+                blocks += 1
+
+        f.write("</body></html>\n")
+
+    return blocks
+
+
+# -------------------------
+# PDF
+# -------------------------
+def _pdf_text(s):
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_stream(rng, page_num):
+    """Two-column text page with a grey 'photo' block, like a Janes spread."""
+    ops = ["0.6 g", "306 470 260 180 re f", "0 g", "BT", "/F1 16 Tf", "40 750 Td",
+           f"({_pdf_text(rng.choice(COUNTRY_WORDS).title())} - page {page_num}) Tj", "ET"]
+
+    y = 720
+    ops += ["BT", "/F1 9 Tf", "40 %d Td" % y, "11 TL"]
+    for _ in range(58):
+        line = " ".join(
+            rng.choice([ship_name(rng), "CLASS", "(PB)", "Radars:", "I-band", FILLER[:40]])
+            for _ in range(4)
+        )
+        ops.append(f"({_pdf_text(line[:60])}) '")
+    ops.append("ET")
+
+    ops += ["BT", "/F1 9 Tf", "306 450 Td", "11 TL"]
+    for _ in range(36):
+        ops.append(f"({_pdf_text(FILLER[rng.randint(0, 60):][:48])}) '")
+    ops.append("ET")
+
+    return zlib.compress("\n".join(ops).encode("latin-1"))
+
+
+def write_pdf(path, pages, seed=0):
+    """Minimal multi-page PDF with real text content (Helvetica) and shapes."""
+    rng = random.Random(seed)
+
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for i in range(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        stream = page_stream(rng, i + 1)
+        objects[content_id] = (
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+            + stream + b"\nendstream"
+        )
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(b"%d 0 R" % page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = {}
+        for num in sorted(objects):
+            offsets[num] = f.tell()
+            f.write(b"%d 0 obj\n" % num + objects[num] + b"\nendobj\n")
+
+        xref = f.tell()
+        size = max(objects) + 1
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for num in range(1, size):
+            f.write(b"%010d 00000 n \n" % offsets[num])
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+
+    return pages
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Janes-style HTML and PDF")
+    parser.add_argument("--countries", type=int, default=50)
+    parser.add_argument("--classes", type=int, default=20,
+                        help="platform classes per country")
+    parser.add_argument("--pages", type=int, default=0,
+                        help="also write a PDF with this many pages")
+    parser.add_argument("--html", default=HTML_FILE)
+    parser.add_argument("--pdf", default=PDF_FILE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    blocks = write_html(args.html, args.countries, args.classes, args.seed)
+    print(f"{args.html}: {args.countries} countries, {blocks} platform classes")
+
+    if args.pages:
+        write_pdf(args.pdf, args.pages, args.seed)
+        print(f"{args.pdf}: {args.pages} pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import os
+import shutil
+import importlib.util
+
+from page_guard import PageTimeout, PageDeadline
+
+
+# -------------------------
+# CONFIG
+# -------------------------
+# Overridable per host: TESSERACT_CMD for the pytesseract fallback binary,
+# TESSDATA_PREFIX for the trained-data directory used by both backends.
+TESSERACT_CMD = os.environ.get("TESSERACT_CMD") or shutil.which("tesseract") or "tesseract"
+TESSDATA = os.environ.get("TESSDATA_PREFIX")
+LANG = "eng"
+OEM = 3          # default: LSTM where available
+PAGE_PSM = 6     # a single uniform block of text
+LINE_PSM = 7     # a single cropped text line
+
+
+# -------------------------
+# ENGINES
+# -------------------------
+class TesserocrEngine:
+    """
+    A long-lived, pre-initialized Tesseract (via tesserocr). The language
+    model is loaded once, and page images are handed over in memory.
+    Not thread-safe: one per process. With a timeout (seconds) recognition
+    is cancelled once the page's budget is spent and PageTimeout raised.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang=LANG, tessdata=TESSDATA, oem=OEM, timeout=None):
+        import tesserocr
+
+        self.tesserocr = tesserocr
+        self.budget = PageDeadline(timeout)
+        # tesserocr's OEM / PSM are namespaces of plain ints, not callable enums
+        kwargs = {"lang": lang, "oem": oem}
+        if tessdata:
+            kwargs["path"] = tessdata
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def start_page(self):
+        """Start the time budget shared by the calls for one page."""
+        self.budget.start()
+
+    def _recognize(self, image, psm):
+        remaining = self.budget.remaining()
+        self.api.SetPageSegMode(psm)
+        self.api.SetImage(image)
+        # Recognize(0) means no limit; a sub-millisecond remainder must not
+        if not self.api.Recognize(max(1, int(remaining * 1000)) if remaining else 0):
+            if remaining:
+                raise PageTimeout(f"{self.budget.timeout:g}s")
+            raise RuntimeError("tesseract recognition failed")
+
+    def text(self, image, psm=PAGE_PSM):
+        self._recognize(image, psm)
+        return self.api.GetUTF8Text()
+
+    def words(self, image, psm=PAGE_PSM):
+        self._recognize(image, psm)
+
+        RIL = self.tesserocr.RIL
+        words = []
+        block = par = ln = 0
+        it = self.api.GetIterator()
+        for r in self.tesserocr.iterate_level(it, RIL.WORD):
+            if r.IsAtBeginningOf(RIL.BLOCK):
+                block, par, ln = block + 1, 0, 0
+            if r.IsAtBeginningOf(RIL.PARA):
+                par, ln = par + 1, 0
+            if r.IsAtBeginningOf(RIL.TEXTLINE):
+                ln += 1
+            text = r.GetUTF8Text(RIL.WORD)
+            box = r.BoundingBox(RIL.WORD)
+            if text and text.strip() and box:
+                words.append({
+                    "text": text,
+                    "confidence": r.Confidence(RIL.WORD) / 100,
+                    "box": tuple(box),
+                    "line": (block, par, ln),
+                })
+        return words
+
+    def close(self):
+        self.api.End()
+
+
+class PytesseractEngine:
+    """Fallback: one tesseract process per call through pytesseract."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang=LANG, tessdata=TESSDATA, oem=OEM, cmd=TESSERACT_CMD, timeout=None):
+        import pytesseract
+
+        self.pytesseract = pytesseract
+        pytesseract.pytesseract.tesseract_cmd = cmd
+        self.lang = lang
+        self.budget = PageDeadline(timeout)
+        self.base = f"--oem {oem}"
+        if tessdata:
+            self.base += f' --tessdata-dir "{tessdata}"'
+
+    def _config(self, psm):
+        return f"{self.base} --psm {psm}"
+
+    def start_page(self):
+        """Start the time budget shared by the calls for one page."""
+        self.budget.start()
+
+    def _run(self, call, image, psm, **kwargs):
+        # pytesseract kills the tesseract process once the page's time is up
+        try:
+            return call(image, lang=self.lang, config=self._config(psm),
+                        timeout=self.budget.remaining() or 0, **kwargs)
+        except RuntimeError as e:
+            if "timeout" in str(e).lower():
+                raise PageTimeout(f"{self.budget.timeout:g}s") from e
+            raise
+
+    def text(self, image, psm=PAGE_PSM):
+        return self._run(self.pytesseract.image_to_string, image, psm)
+
+    def words(self, image, psm=PAGE_PSM):
+        data = self._run(self.pytesseract.image_to_data, image, psm,
+                         output_type=self.pytesseract.Output.DICT)
+        words = []
+        for i, text in enumerate(data["text"]):
+            conf = float(data["conf"][i])
+            if conf >= 0 and text.strip():
+                x, y = data["left"][i], data["top"][i]
+                words.append({
+                    "text": text,
+                    "confidence": conf / 100,
+                    "box": (x, y, x + data["width"][i], y + data["height"][i]),
+                    "line": (data["block_num"][i], data["par_num"][i], data["line_num"][i]),
+                })
+        return words
+
+    def close(self):
+        pass
+
+
+# -------------------------
+# PER-PROCESS ENGINE
+# -------------------------
+SETTINGS = {"lang": LANG, "tessdata": TESSDATA, "cmd": TESSERACT_CMD, "backend": "auto",
+            "timeout": None}
+ENGINE = None
+
+
+def configure(settings):
+    """
+    Set engine settings for this process; also the Pool initializer, so
+    every worker builds its own engine once, on its first page.
+    """
+    global ENGINE
+    SETTINGS.update({k: v for k, v in settings.items() if v is not None})
+    if ENGINE is not None:
+        ENGINE.close()
+        ENGINE = None
+
+
+def backend_name(backend="auto"):
+    """The backend make_engine will use, without starting an engine."""
+    if backend == "auto":
+        return "tesserocr" if importlib.util.find_spec("tesserocr") else "pytesseract"
+    return backend
+
+
+def make_engine(lang=LANG, tessdata=TESSDATA, cmd=TESSERACT_CMD, backend="auto", timeout=None):
+    if backend_name(backend) == "tesserocr":
+        return TesserocrEngine(lang, tessdata, timeout=timeout)
+    return PytesseractEngine(lang, tessdata, cmd=cmd, timeout=timeout)
+
+
+def engine():
+    """This process's engine, created on first use."""
+    global ENGINE
+    if ENGINE is None:
+        ENGINE = make_engine(**SETTINGS)
+    return ENGINE
+
+
+def add_engine_args(parser):
+    parser.add_argument("--tesseract-cmd", default=TESSERACT_CMD,
+                        help="tesseract binary for the pytesseract fallback "
+                             "(default: $TESSERACT_CMD or tesseract on PATH)")
+    parser.add_argument("--tessdata", default=TESSDATA,
+                        help="trained-data directory (default: $TESSDATA_PREFIX)")
+    parser.add_argument("--lang", default=LANG)
+    parser.add_argument("--backend", choices=["auto", "tesserocr", "pytesseract"], default="auto",
+                        help="auto keeps a persistent tesserocr engine per worker when "
+                             "installed and falls back to a tesseract process per page")
+
+
+def engine_settings(args):
+    return {"lang": args.lang, "tessdata": args.tessdata,
+            "cmd": args.tesseract_cmd, "backend": args.backend}
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janes_diff import Entry, link, changes_of, score  # noqa: E402
+from janes_records import Platform  # noqa: E402
+
+
+def entries(*platforms):
+    return [Entry(i, p) for i, p in enumerate(platforms)]
+
+
+PBFG = Platform("Croatia", "PATROL FORCES", "(FAST ATTACK CRAFT-MISSILE) (PBFG)",
+                ["VUKOVAR", "DUBROVNIK", "SIBENIK"])
+PGG = Platform("Croatia", "SUBMARINES", "(FAST ATTACK CRAFT-MISSILE) (PGG)")
+
+
+def test_unchanged_class_is_linked_to_itself_not_a_shipless_twin():
+    old = entries(PGG, PBFG)
+    new = entries(PBFG)
+    links, removed, added = link(old, new)
+
+    assert [(a.platform, b.platform) for a, b, _ in links] == [(PBFG, PBFG)]
+    assert [a.platform for a in removed] == [PGG]
+    assert not added
+    assert not changes_of(*links[0][:2])
+
+
+def test_duplicate_class_keys_pair_up_in_order():
+    salvage = [Platform("Argentina", "PATROL FORCES", "1 SALVAGE SHIP (WARS)") for _ in range(3)]
+    named = Platform("Argentina", "LAND-BASED MARITIME AIRCRAFT", "1 SALVAGE SHIP (WARS)",
+                     ["CORREA FALCON", "MARIANO MORENO"])
+    old = entries(*salvage, named)
+    new = entries(salvage[0], salvage[1], named)
+    links, removed, added = link(old, new)
+
+    assert [(a.index, b.index) for a, b, _ in links] == [(0, 0), (1, 1), (3, 2)]
+    assert [a.index for a in removed] == [2]
+    assert all(not changes_of(a, b) for a, b, _ in links)
+
+
+def test_one_sided_ship_list_is_not_a_perfect_match():
+    a, b = entries(PBFG)[0], entries(PGG)[0]
+    assert score(a, b) < 0.5
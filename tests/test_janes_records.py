@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janes_records import Platform, Radar, export_columnar  # noqa: E402
+
+pa = pytest.importorskip("pyarrow")
+
+
+def platforms():
+    # new dictionary values keep turning up in later batches
+    for i in range(7):
+        yield Platform(
+            f"Country {i % 3}", "PATROL FORCES" if i % 2 else "FRIGATES", f"CLASS {i}",
+            [f"SHIP {i}"],
+            [Radar("Navigation", f"Radar {i}", f"{'IJ'[i % 2]}-band",
+                   None if i % 4 else f"Radar {i}")],
+        )
+
+
+def expected():
+    return ([p.country for p in platforms()],
+            [r.canonical for p in platforms() for r in p.radars])
+
+
+def test_parquet_export_in_batches(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    assert export_columnar(platforms(), str(tmp_path), "parquet", batch_size=2) == (7, 7)
+    countries, canonical = expected()
+    assert pq.read_table(tmp_path / "platforms.parquet").column("country").to_pylist() == countries
+    assert pq.read_table(tmp_path / "radars.parquet").column("radar_canonical").to_pylist() == canonical
+
+
+def test_arrow_export_in_batches(tmp_path):
+    ipc = pytest.importorskip("pyarrow.ipc")
+    assert export_columnar(platforms(), str(tmp_path), "arrow", batch_size=2) == (7, 7)
+    countries, canonical = expected()
+    table = ipc.open_file(str(tmp_path / "platforms.arrow")).read_all()
+    assert table.column("country").to_pylist() == countries
+    assert table.num_rows == 7
+    radars = ipc.open_file(str(tmp_path / "radars.arrow")).read_all()
+    assert radars.column("radar_canonical").to_pylist() == canonical
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from janes_stream import iter_elements, iter_soup_elements  # noqa: E402
+
+CASES = [
+    "<p>before<br></br>after</p>",
+    "<p>a<img src=x></img>b<br>c</br>d</p>",
+    "<p>one</b>two</td>three</p>",
+    "<p>&copy2023 &copy; &amp &ltx &foo; &#65x &#x41; &#128;</p>",
+    "<span class='a b'>&nbsp;</span><p> \n </p><pre> a </pre>",
+    "<p>x<![CDATA[Y]]>z</p><p>a<![cdata[ ]]>b<![if !IE]>c<![endif]>d</p>",
+]
+
+
+@pytest.mark.parametrize("doc", CASES)
+def test_stream_matches_soup(tmp_path, doc):
+    pytest.importorskip("bs4")
+    path = tmp_path / "page.htm"
+    path.write_text(doc, encoding="utf-8")
+
+    def texts(elements):
+        return [(el.name, el.get_text("|"), el.get("class")) for el in elements]
+
+    assert texts(iter_elements(path, chunk_size=5)) == texts(iter_soup_elements(path))
+
+
+def test_semicolonless_entity_with_trailing_name_stays_literal(tmp_path):
+    path = tmp_path / "page.htm"
+    path.write_text("<p>&copy2023 &copy;</p>", encoding="utf-8")
+    assert [el.get_text() for el in iter_elements(path)] == ["&copy2023 ©"]
@@ -0,0 +1,49 @@
+import os
+import sys
+import json
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_guard import PageDeadline, PageFailures, PageTimeout  # noqa: E402
+
+
+def test_calls_share_one_page_budget():
+    budget = PageDeadline(0.2)
+    budget.start()
+    assert 0 < budget.remaining() <= 0.2
+    time.sleep(0.1)
+    assert budget.remaining() <= 0.1
+    time.sleep(0.15)
+    with pytest.raises(PageTimeout):
+        budget.remaining()
+
+    # the next page gets the full budget again
+    budget.start()
+    assert budget.remaining() > 0.15
+
+
+def test_no_budget():
+    budget = PageDeadline(0)
+    budget.start()
+    assert budget.remaining() is None
+
+
+def test_report_lists_failed_and_recovered_pages(tmp_path):
+    def timeout():
+        raise PageTimeout("1s")
+
+    failures = PageFailures()
+    assert failures.attempt(3, [("full", timeout), ("120dpi", lambda: "text")]) == ("text", "120dpi")
+    assert failures.attempt(1, [("full", timeout), ("120dpi", timeout)]) == (None, None)
+    assert failures.attempt(2, [("full", lambda: "text")]) == ("text", "full")
+
+    path = tmp_path / "failed_pages.json"
+    failures.write(str(path))
+    assert json.loads(path.read_text()) == [
+        {"page": 1, "errors": ["full: timeout (1s)", "120dpi: timeout (1s)"]},
+        {"page": 3, "errors": ["full: timeout (1s)"], "recovered": "120dpi"},
+    ]
+    assert "1 recovered by a retry" in failures.report(str(path))
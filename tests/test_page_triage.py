@@ -0,0 +1,28 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("PIL")
+
+from page_triage import clear_skipped, NONE, OCR, STRUCTURE  # noqa: E402
+
+
+def test_clear_skipped_pages_only(tmp_path):
+    log = tmp_path / "triage.jsonl"
+    decisions = {1: OCR, 2: NONE, 3: STRUCTURE, 4: NONE}
+    calls = []
+
+    def clear(page_num):
+        calls.append(page_num)
+        return [f"page-{page_num}.txt"] if page_num == 2 else []
+
+    clear_skipped("book.pdf", decisions, {OCR, STRUCTURE}, clear, str(log))
+    assert calls == [2, 4]
+    # only pages that had something to clear are logged
+    assert [json.loads(l) for l in log.read_text().splitlines()] == [
+        {"pdf": "book.pdf", "page": 2, "decision": NONE, "cleared": ["page-2.txt"]},
+    ]
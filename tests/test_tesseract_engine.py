@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tesserocr = pytest.importorskip("tesserocr")
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+from tesseract_engine import TesserocrEngine, LINE_PSM  # noqa: E402
+
+
+def small_image():
+    image = Image.new("L", (240, 60), 255)
+    ImageDraw.Draw(image).text((10, 20), "RADAR 1234", fill=0)
+    return image.resize((720, 180))
+
+
+def test_tesserocr_engine_builds_and_reads_one_image():
+    engine = TesserocrEngine()
+    try:
+        image = small_image()
+        assert isinstance(engine.text(image), str)
+        words = engine.words(image, psm=LINE_PSM)
+        assert all(0 <= w["confidence"] <= 1 for w in words)
+        assert all(len(w["box"]) == 4 for w in words)
+    finally:
+        engine.close()